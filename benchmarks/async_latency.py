@@ -0,0 +1,86 @@
+"""
+Request latency and event loop lag of an asyncio service segmenting concurrent requests,
+with text_to_words called in the event loop, and with atext_to_words (in threads, and in worker processes).
+Calling text_to_words in the event loop looks fast per request, but blocks every other request and task
+meanwhile, which shows as event loop lag.
+
+Run from the repository root:
+    python -m benchmarks.async_latency --clients 64 --requests 20 --processes 4
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.corpora import generate_text
+from words_segmentation.async_segmenter import AsyncSegmenter
+from words_segmentation.languages import warmup
+from words_segmentation.pretokenizer import text_to_words
+
+
+async def _sync_text_to_words(text: str) -> list[str]:
+    return text_to_words(text)
+
+
+async def _client(segment, texts: list[str], latencies: list[float]):
+    for text in texts:
+        start = time.perf_counter()
+        await segment(text)
+        latencies.append(time.perf_counter() - start)
+
+
+async def _ticker(lags: list[float], stop: asyncio.Event, interval: float = 1e-3):
+    """Record how late the event loop wakes up a task that sleeps for interval."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def measure(segment, texts: list[str], clients: int) -> dict:
+    latencies, lags = [], []
+    start = time.perf_counter()
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    await asyncio.gather(*(_client(segment, texts[i::clients], latencies) for i in range(clients)))
+    stop.set()
+    await ticker
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {"p50": quantiles[49], "p99": quantiles[98], "loop_lag": max(lags, default=0),
+            "seconds": time.perf_counter() - start}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=64, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client")
+    parser.add_argument("--length", type=int, default=2_000, help="Characters per request")
+    parser.add_argument("--processes", type=int, default=4, help="Worker processes for atext_to_words")
+    args = parser.parse_args()
+
+    warmup()
+    scripts = ["Latin", "Han", "Kana", "Mixed"]
+    texts = [generate_text(scripts[i % len(scripts)], args.length, seed=i) for i in range(args.clients * args.requests)]
+
+    print("| Mode | p50 latency (ms) | p99 latency (ms) | Max event loop lag (ms) | Total (s) |")
+    print("|------|------------------|------------------|-------------------------|-----------|")
+    with ProcessPoolExecutor(max_workers=args.processes, initializer=warmup) as executor:
+        modes = {
+            "text_to_words": lambda: _sync_text_to_words,
+            "atext_to_words (threads)": lambda: AsyncSegmenter().atext_to_words,
+            f"atext_to_words ({args.processes} processes)": lambda: AsyncSegmenter(executor).atext_to_words,
+        }
+        for name, make_segment in modes.items():
+            async def run(make_segment=make_segment):
+                return await measure(make_segment(), texts, args.clients)
+
+            result = asyncio.run(run())
+            print(f"| {name} | {result['p50'] * 1e3:.1f} | {result['p99'] * 1e3:.1f} "
+                  f"| {result['loop_lag'] * 1e3:.1f} | {result['seconds']:.2f} |")
+
+
+if __name__ == "__main__":
+    main()
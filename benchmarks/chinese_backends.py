@@ -0,0 +1,118 @@
+"""
+Compare the Chinese segmentation backends: jieba (chinese.segment_chinese) and the memory-mapped trie
+with NumPy routes (chinese_dag.segment_chinese_dag).
+
+- Agreement: texts segmented identically, and the F1 score of word boundaries, on a reference corpus
+  (the bundled Chinese sample, and random strings of dictionary characters, which stress ties and unknown words).
+- Cold start: time to segment the first text in a fresh interpreter, and its peak memory.
+- Throughput: characters per second, one text at a time and batched.
+
+Run from the repository root:
+    python -m benchmarks.chinese_backends
+"""
+
+import argparse
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.corpora import generate_text
+from words_segmentation.chinese import segment_chinese
+from words_segmentation.chinese_dag import get_chinese_dictionary, segment_chinese_batch, segment_chinese_dag
+
+# Peak memory from /proc (Linux): ru_maxrss of a child process starts at its parent's peak when forked
+_COLD_START_SCRIPT = """
+import re, time
+start = time.perf_counter()
+from words_segmentation.{module} import {function}
+{function}("我爱北京天安门")
+print(time.perf_counter() - start)
+print(re.search(r"VmHWM:\\s*(\\d+) kB", open("/proc/self/status").read()).group(1))
+"""
+BACKENDS = {"jieba": ("chinese", "segment_chinese"), "trie": ("chinese_dag", "segment_chinese_dag")}
+
+
+def reference_corpus(num_texts: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    characters = get_chinese_dictionary().alphabet[:3000]  # The most frequent characters
+    texts = [generate_text("Han", 50, seed=i) for i in range(num_texts // 2)]
+    texts += ["".join(rng.choices(characters, k=rng.randint(1, 60))) for _ in range(num_texts - len(texts))]
+    return texts
+
+
+def _boundaries(words: list[str]) -> set[int]:
+    boundaries = set()
+    position = 0
+    for word in words:
+        position += len(word)
+        boundaries.add(position)
+    return boundaries
+
+
+def agreement(texts: list[str]) -> tuple[float, float]:
+    """Fraction of texts segmented identically, and the F1 score of the trie backend's word boundaries."""
+    identical = true_positives = predicted = expected = 0
+    for text, words in zip(texts, segment_chinese_batch(texts), strict=True):
+        reference = segment_chinese(text)
+        identical += words == reference
+        words, reference = _boundaries(words), _boundaries(reference)
+        true_positives += len(words & reference)
+        predicted += len(words)
+        expected += len(reference)
+    return identical / len(texts), 2 * true_positives / (predicted + expected)
+
+
+def cold_start(backend: str, repeat: int) -> tuple[float, float]:
+    """Median seconds to import and segment a first text in a fresh interpreter, and peak memory in MB."""
+    module, function = BACKENDS[backend]
+    seconds, memory = [], []
+    for _ in range(repeat):
+        script = _COLD_START_SCRIPT.format(module=module, function=function)
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        elapsed, peak_kb = output.splitlines()
+        seconds.append(float(elapsed))
+        memory.append(int(peak_kb) / 1024)
+    return statistics.median(seconds), statistics.median(memory)
+
+
+def throughput(segment, texts: list[str], min_time: float) -> float:
+    """Characters per second of segment(texts)."""
+    num_chars = sum(map(len, texts))
+    runs = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_time or runs == 0:
+        segment(texts)
+        runs += 1
+    return runs * num_chars / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-texts", type=int, default=2000, help="Texts in the reference corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per cold start measurement")
+    parser.add_argument("--min-time", type=float, default=2.0, help="Seconds per throughput measurement")
+    args = parser.parse_args()
+
+    texts = reference_corpus(args.num_texts)
+    identical, f1 = agreement(texts)
+    print(f"Agreement with jieba on {len(texts):,} texts: {identical:.2%} identical, boundary F1 {f1:.4f}\n")
+
+    print("| Backend | First text (ms) | Peak memory (MB) |")
+    print("|---------|-----------------|------------------|")
+    for backend in BACKENDS:
+        seconds, memory = cold_start(backend, args.repeat)
+        print(f"| {backend} | {seconds * 1e3:.0f} | {memory:.0f} |", flush=True)
+
+    print("\n| Backend | One text at a time (chars/s) | Batched (chars/s) |")
+    print("|---------|------------------------------|-------------------|")
+    one_at_a_time = throughput(lambda batch: [segment_chinese(text) for text in batch], texts, args.min_time)
+    print(f"| jieba | {one_at_a_time:,.0f} | - |", flush=True)
+    one_at_a_time = throughput(lambda batch: [segment_chinese_dag(text) for text in batch], texts, args.min_time)
+    batched = throughput(segment_chinese_batch, texts, args.min_time)
+    print(f"| trie | {one_at_a_time:,.0f} | {batched:,.0f} |")
+
+
+if __name__ == "__main__":
+    main()
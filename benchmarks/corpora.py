@@ -0,0 +1,44 @@
+"""
+Offline benchmark corpora, generated from bundled sample texts for every script.
+"""
+
+import random
+
+import regex
+
+from examples.parity_texts import texts
+
+SIGNWRITING_SAMPLE = " ".join([
+    "𝠀񀀒񀀚񋚥񋛩𝠃𝤟𝤩񋛩𝣵𝤐񀀒𝤇𝣤񋚥𝤐𝤆񀀚𝣮𝣭",
+    "𝠀񂇢񂇈񆙡񋎥񋎵𝠃𝤛𝤬񂇈𝤀𝣺񂇢𝤄𝣻񋎥𝤄𝤗񋎵𝤃𝣟񆙡𝣱𝣸",
+    "𝠃𝤙𝤞񀀙𝣷𝤀񅨑𝣼𝤀񆉁𝣳𝣮",
+    "𝠀񆄱񈠣񍉡𝠃𝤛𝤵񍉡𝣴𝣵񆄱𝤌𝤆񈠣𝤉𝤚",
+])
+
+SCRIPT_SAMPLES = {
+    "Latin": " ".join(texts[lang] for lang in ("English", "Italian", "German", "Finnish")),
+    "Cyrillic": texts["Russian"],
+    "Arabic": texts["Arabic"],
+    "Hebrew": texts["Hebrew"],
+    "Indic": " ".join(texts[lang] for lang in ("Tamil", "Kannada")),
+    "Han": texts["Chinese"],
+    "Kana": texts["Japanese"],
+    "SignWriting": SIGNWRITING_SAMPLE,
+}
+SCRIPT_SAMPLES["Mixed"] = " ".join(SCRIPT_SAMPLES.values())
+
+# Split after whitespace or punctuation, so scripts without spaces also give many pieces
+_PIECES_PATTERN = regex.compile(r"(?<=[\s\p{Po}])")
+
+
+def generate_text(script: str, num_chars: int, seed: int = 0) -> str:
+    """Generate text of at least num_chars characters, by sampling pieces of the script's sample text."""
+    pieces = [piece for piece in _PIECES_PATTERN.split(SCRIPT_SAMPLES[script]) if piece]
+    rng = random.Random(f"{script}-{num_chars}-{seed}")
+    generated = []
+    length = 0
+    while length < num_chars:
+        piece = rng.choice(pieces)
+        generated.append(piece)
+        length += len(piece)
+    return "".join(generated)
@@ -0,0 +1,34 @@
+"""
+Compare segment_text, which skips the master regex for text without explicit-script characters,
+with running the master regex over the same Latin-script samples.
+
+Run from the repository root:
+    python -m benchmarks.default_fast_path
+"""
+
+import timeit
+from itertools import chain
+
+from examples.parity_texts import LATIN_LANGUAGES, texts
+from words_segmentation.languages import LANGUAGE_SPECS, build_regex_from_languages, segment_text
+
+
+def segment_text_master_regex(text: str) -> list[str]:
+    pat = build_regex_from_languages()
+    return list(chain.from_iterable(LANGUAGE_SPECS[m.lastgroup]["callback"](m.group(0)) for m in pat.finditer(text)))
+
+
+def segment_text_fast_path(text: str) -> list[str]:
+    return list(chain.from_iterable(segment_text(text)))
+
+
+if __name__ == "__main__":
+    number = 2000
+    print("| Language | Master regex (µs) | Fast path (µs) | Speedup |")
+    print("|----------|-------------------|----------------|---------|")
+    for lang in LATIN_LANGUAGES:
+        text = texts[lang]
+        assert segment_text_fast_path(text) == segment_text_master_regex(text)
+        master = timeit.timeit(lambda t=text: segment_text_master_regex(t), number=number) / number * 1e6
+        fast = timeit.timeit(lambda t=text: segment_text_fast_path(t), number=number) / number * 1e6
+        print(f"| {lang} | {master:.1f} | {fast:.1f} | {master / fast:.1f}x |")
@@ -0,0 +1,76 @@
+"""
+Cold-start cost: import time of every module in a fresh interpreter, the heavy dependencies each one loads,
+and the time for a new worker process to segment its first text (spawned, or forked after warmup()).
+
+Run from the repository root:
+    python -m benchmarks.import_time
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from words_segmentation.languages import warmup
+from words_segmentation.pretokenizer import text_to_words
+
+MODULES = [
+    "words_segmentation.languages",
+    "words_segmentation.pretokenizer",
+    "words_segmentation.stopping_criteria",
+    "words_segmentation.tokenizer",
+]
+HEAVY_MODULES = ["torch", "transformers", "utf8_tokenizer"]
+
+_IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure_import(module: str, repeat: int) -> tuple[float, list[str]]:
+    """Median seconds to import module in a fresh interpreter, and the heavy modules it loaded."""
+    seconds = []
+    for _ in range(repeat):
+        script = _IMPORT_SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        elapsed, loaded = output.splitlines()
+        seconds.append(float(elapsed))
+    return statistics.median(seconds), [name for name in loaded.split(",") if name]
+
+
+def measure_worker(method: str, repeat: int) -> float:
+    """Median seconds from starting a batch worker process until it returns its first segmented text."""
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context(method), initializer=warmup) as executor:
+            executor.submit(text_to_words, "hello 我爱北京天安门").result()
+            seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement")
+    args = parser.parse_args()
+
+    print("| Module | Import (ms) | Loads |")
+    print("|--------|-------------|-------|")
+    for module in MODULES:
+        seconds, loaded = measure_import(module, args.repeat)
+        print(f"| {module} | {seconds * 1e3:.0f} | {', '.join(loaded) or '-'} |", flush=True)
+
+    print(f"\nSpawned worker, first text: {measure_worker('spawn', args.repeat) * 1e3:.0f} ms")
+    warmup()
+    print(f"Forked worker after warmup(), first text: {measure_worker('fork', args.repeat) * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
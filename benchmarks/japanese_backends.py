@@ -0,0 +1,92 @@
+"""
+Compare the Japanese segmentation paths of the MeCab tagger: a fugashi Node per morpheme (str(node) for each),
+and the surfaces split from its wakati output (japanese.segment_japanese).
+
+- Agreement: texts segmented identically, on the bundled Japanese sample and on Japanese spans of mixed text.
+- Allocation: peak memory per morpheme while segmenting a long text (tracemalloc).
+- Throughput: characters per second, one span at a time and batched.
+
+Run from the repository root:
+    python -m benchmarks.japanese_backends
+"""
+
+import argparse
+import time
+import tracemalloc
+from functools import partial
+
+from benchmarks.corpora import generate_text
+from words_segmentation.japanese import get_japanese_tagger, segment_japanese, segment_japanese_batch
+from words_segmentation.languages import iter_spans
+
+
+def segment_japanese_nodes(text: str) -> list[str]:
+    """The node-based path: fugashi builds a Node (with its features) per morpheme."""
+    return [str(word) for word in get_japanese_tagger()(text)]
+
+
+BACKENDS = {"nodes": segment_japanese_nodes, "wakati": segment_japanese}
+
+
+def reference_corpus(num_texts: int) -> list[str]:
+    """Japanese sample texts, and the Japanese spans of mixed texts (mostly short)."""
+    texts = [generate_text("Kana", 200, seed=i) for i in range(num_texts // 2)]
+    for seed in range(num_texts):
+        text = generate_text("Mixed", 2000, seed=seed)
+        texts += [text[start:end] for name, start, end in iter_spans(text) if name == "Japanese"]
+        if len(texts) >= num_texts:
+            break
+    return texts[:num_texts]
+
+
+def agreement(texts: list[str]) -> float:
+    """Fraction of texts segmented identically by both paths."""
+    return sum(segment_japanese(text) == segment_japanese_nodes(text) for text in texts) / len(texts)
+
+
+def peak_bytes_per_morpheme(segment, text: str) -> float:
+    num_morphemes = len(segment(text))
+    tracemalloc.start()
+    segment(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / num_morphemes
+
+
+def _segment_each(segment, texts: list[str]) -> list[list[str]]:
+    return [segment(text) for text in texts]
+
+
+def throughput(segment, texts: list[str], min_time: float) -> float:
+    """Characters per second of segment(texts)."""
+    num_chars = sum(map(len, texts))
+    runs = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_time or runs == 0:
+        segment(texts)
+        runs += 1
+    return runs * num_chars / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-texts", type=int, default=2000, help="Texts in the reference corpus")
+    parser.add_argument("--min-time", type=float, default=2.0, help="Seconds per throughput measurement")
+    args = parser.parse_args()
+
+    texts = reference_corpus(args.num_texts)
+    print(f"Agreement on {len(texts):,} texts: {agreement(texts):.2%} identical\n")
+
+    long_text = generate_text("Kana", 100_000)
+    print("| Path | Peak memory per morpheme (bytes) | One span at a time (chars/s) | Batched (chars/s) |")
+    print("|------|----------------------------------|------------------------------|-------------------|")
+    for name, segment in BACKENDS.items():
+        memory = peak_bytes_per_morpheme(segment, long_text)
+        one_at_a_time = throughput(partial(_segment_each, segment), texts, args.min_time)
+        batched = throughput(segment_japanese_batch, texts, args.min_time) if name == "wakati" else None
+        print(f"| {name} | {memory:,.0f} | {one_at_a_time:,.0f} | {'-' if batched is None else f'{batched:,.0f}'} |",
+              flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Segmentation throughput from many threads of one process (e.g. a threaded web server), per number of threads.
+
+Language callbacks are safe to call concurrently: MeCab taggers come from a bounded pool (see pool.InstancePool),
+so every thread parses with its own. Throughput only scales where the segmenters run without the GIL:
+fugashi and jieba hold it, so with the GIL threads mostly take turns, and free-threaded Python is needed to scale.
+
+Run from the repository root:
+    python -m benchmarks.thread_scaling
+"""
+
+import argparse
+import os
+import sys
+import sysconfig
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.corpora import generate_text
+from words_segmentation.japanese import get_japanese_tagger_pool
+from words_segmentation.languages import warmup
+from words_segmentation.pretokenizer import text_to_words
+
+
+def throughput(texts: list[str], num_threads: int, min_time: float) -> float:
+    """Characters per second of text_to_words over texts, in num_threads threads."""
+    num_chars = sum(map(len, texts))
+    runs = 0
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        start = time.perf_counter()
+        while (elapsed := time.perf_counter() - start) < min_time or runs == 0:
+            list(executor.map(text_to_words, texts))
+            runs += 1
+    return runs * num_chars / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scripts", nargs="+", default=["Kana", "Mixed"], help="Scripts of the texts")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="Numbers of threads")
+    parser.add_argument("--num-texts", type=int, default=200, help="Texts per run")
+    parser.add_argument("--min-time", type=float, default=2.0, help="Seconds per measurement")
+    args = parser.parse_args()
+
+    gil = "disabled" if sysconfig.get_config_var("Py_GIL_DISABLED") and not sys._is_gil_enabled() else "enabled"
+    print(f"Python {sys.version.split()[0]}, GIL {gil}, {os.cpu_count()} CPUs\n")
+    warmup()
+
+    print("| Script | Threads | Chars/s | Speedup | Taggers |")
+    print("|--------|---------|---------|---------|---------|")
+    for script in args.scripts:
+        texts = [generate_text(script, 500, seed=i) for i in range(args.num_texts)]
+        baseline = None
+        for num_threads in args.threads:
+            chars_per_second = throughput(texts, num_threads, args.min_time)
+            baseline = baseline or chars_per_second
+            print(f"| {script} | {num_threads} | {chars_per_second:,.0f} | {chars_per_second / baseline:.2f}x "
+                  f"| {len(get_japanese_tagger_pool())} |", flush=True)
+
+
+if __name__ == "__main__":
+    main()
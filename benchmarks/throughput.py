@@ -0,0 +1,103 @@
+"""
+Segmentation throughput (words/sec and MB/sec) per script, text length and max_bytes.
+
+Run from the repository root:
+    python -m benchmarks.throughput --output results.json
+    python -m benchmarks.throughput --compare results.json  # Compare against earlier results
+"""
+
+import argparse
+import json
+import math
+import platform
+import time
+
+from benchmarks.corpora import SCRIPT_SAMPLES, generate_text
+from words_segmentation.pretokenizer import text_to_words
+
+
+def _max_bytes(value: str) -> float:
+    return math.inf if value == "inf" else int(value)
+
+
+def _result_key(result: dict) -> tuple:
+    return result["script"], result["length"], result["max_bytes"]
+
+
+def measure(text: str, max_bytes: int, min_time: float) -> dict:
+    """Repeat text_to_words for at least min_time seconds."""
+    words = text_to_words(text, max_bytes=max_bytes)  # Warm up
+    runs = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_time or runs == 0:
+        text_to_words(text, max_bytes=max_bytes)
+        runs += 1
+
+    num_bytes = len(text.encode("utf-8"))
+    return {
+        "words": len(words),
+        "bytes": num_bytes,
+        "seconds": elapsed / runs,
+        "words_per_second": len(words) * runs / elapsed,
+        "mb_per_second": num_bytes * runs / elapsed / 1e6,
+    }
+
+
+def run(scripts: list[str], lengths: list[int], max_bytes_values: list[float], min_time: float) -> list[dict]:
+    results = []
+    for script in scripts:
+        for length in lengths:
+            text = generate_text(script, length)
+            for max_bytes in max_bytes_values:
+                result = {
+                    "script": script,
+                    "length": length,
+                    "max_bytes": None if max_bytes == math.inf else max_bytes,
+                    **measure(text, max_bytes, min_time),
+                }
+                results.append(result)
+                print(f"| {script} | {length} | {max_bytes} | {result['words_per_second']:,.0f} "
+                      f"| {result['mb_per_second']:.2f} |", flush=True)
+    return results
+
+
+def compare(results: list[dict], baseline: list[dict]):
+    """Print the throughput ratio of every result compared to the baseline (above 1 is faster)."""
+    baseline_by_key = {_result_key(result): result for result in baseline}
+    print("| Script | Length | max_bytes | Speedup |")
+    print("|--------|--------|-----------|---------|")
+    for result in results:
+        base = baseline_by_key.get(_result_key(result))
+        if base is not None:
+            ratio = result["mb_per_second"] / base["mb_per_second"]
+            max_bytes = math.inf if result["max_bytes"] is None else result["max_bytes"]
+            print(f"| {result['script']} | {result['length']} | {max_bytes} | {ratio:.2f}x |")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scripts", nargs="+", default=list(SCRIPT_SAMPLES), choices=list(SCRIPT_SAMPLES))
+    parser.add_argument("--lengths", nargs="+", type=int, default=[100, 10_000, 1_000_000],
+                        help="Text lengths, in characters")
+    parser.add_argument("--max-bytes", nargs="+", type=_max_bytes, default=[math.inf, 16],
+                        help="max_bytes values ('inf' for no limit)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum seconds to measure each setting")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Compare results to an earlier JSON results file")
+    args = parser.parse_args()
+
+    print("| Script | Length | max_bytes | Words/sec | MB/sec |")
+    print("|--------|--------|-----------|-----------|--------|")
+    results = run(args.scripts, args.lengths, args.max_bytes, args.min_time)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(), "results": results},
+                      f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Microbenchmark is_word_complete, compared to calling re.fullmatch with every raw pattern.
+
+Run from the repository root:
+    python -m benchmarks.word_completion
+"""
+
+import re
+import timeit
+
+from words_segmentation.control import CONTROL_TOKENS_PATTERN
+from words_segmentation.pretokenizer import is_word_complete
+
+_PATTERNS = [
+    rf"[{CONTROL_TOKENS_PATTERN}]",
+    rf"[^\s{CONTROL_TOKENS_PATTERN}]+\s",
+]
+
+
+def is_word_complete_raw_patterns(text: str) -> bool:
+    return any(re.fullmatch(pattern, text) for pattern in _PATTERNS)
+
+
+# Texts as seen while generating a word, one character at a time
+word = "Retket ovat halvempia suuremmille ryhmille "
+cases = {
+    "Generating a word": [word[:i] for i in range(1, word.index(" ") + 2)] * 100,
+    "Long incomplete text": ["a" * 1000] * 100,
+    "Complete words": ["hello ", "עמית ", "\x01"] * 100,
+}
+
+if __name__ == "__main__":
+    number = 200
+    print("| Texts | Raw patterns (µs) | is_word_complete (µs) |")
+    print("|-------|-------------------|-----------------------|")
+    for name, texts in cases.items():
+        assert [is_word_complete(text) for text in texts] == [is_word_complete_raw_patterns(text) for text in texts]
+        raw = timeit.timeit(lambda t=texts: [is_word_complete_raw_patterns(text) for text in t], number=number)
+        single = timeit.timeit(lambda t=texts: [is_word_complete(text) for text in t], number=number)
+        print(f"| {name} | {raw / number * 1e6:.0f} | {single / number * 1e6:.0f} |")
@@ -0,0 +1,43 @@
+"""
+Memory per word of text_to_words results, as a list of str and as CompactWords.
+
+Run from the repository root:
+    python -m benchmarks.word_memory
+"""
+
+import argparse
+import tracemalloc
+
+from benchmarks.corpora import SCRIPT_SAMPLES, generate_text
+from words_segmentation.languages import warmup
+from words_segmentation.pretokenizer import text_to_words
+
+
+def measure(text: str, compact: bool) -> tuple[int, int]:
+    """Number of words, and bytes allocated for the result."""
+    tracemalloc.start()
+    words = text_to_words(text, compact=compact)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(words), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scripts", nargs="+", default=list(SCRIPT_SAMPLES), choices=list(SCRIPT_SAMPLES))
+    parser.add_argument("--length", type=int, default=1_000_000, help="Text length, in characters")
+    args = parser.parse_args()
+
+    warmup()
+    print("| Script | Words | list[str] (bytes/word) | CompactWords (bytes/word) | Reduction |")
+    print("|--------|-------|------------------------|---------------------------|-----------|")
+    for script in args.scripts:
+        text = generate_text(script, args.length)
+        num_words, list_size = measure(text, compact=False)
+        _, compact_size = measure(text, compact=True)
+        print(f"| {script} | {num_words:,} | {list_size / num_words:.1f} | {compact_size / num_words:.1f} "
+              f"| {list_size / compact_size:.1f}x |", flush=True)
+
+
+if __name__ == "__main__":
+    main()
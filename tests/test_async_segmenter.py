@@ -0,0 +1,141 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from words_segmentation.async_segmenter import AsyncSegmenter, asegment_text, atext_to_words
+from words_segmentation.languages import segment_text, warmup
+from words_segmentation.pretokenizer import text_to_words
+
+TEXTS = ["hello world", "我爱北京天安门", "すもももももももものうち", "Retket ovat halvempia 👩‍👩‍👧‍👦"]
+
+
+def test_atext_to_words():
+    """Test atext_to_words and asegment_text return the same words as their sync versions."""
+    async def main():
+        words = await atext_to_words("hello world! 我爱北京天安门", max_bytes=4)
+        spans = await asegment_text("hello world! 我爱北京天安门")
+        return words, spans
+
+    words, spans = asyncio.run(main())
+    assert words == text_to_words("hello world! 我爱北京天安门", max_bytes=4)
+    assert spans == [list(span) for span in segment_text("hello world! 我爱北京天安门")]
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """Thread pool that records the texts of every job, and runs jobs only once released."""
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.jobs = []
+        self.released = threading.Event()
+        self.released.set()
+
+    def submit(self, fn, calls):
+        self.jobs.append([text for _, text in calls])
+        return super().submit(self._run_when_released, fn, calls)
+
+    def _run_when_released(self, fn, calls):
+        self.released.wait()
+        return fn(calls)
+
+
+def test_concurrent_requests_are_micro_batched():
+    """Test concurrent requests are sent to the executor in batches, with results in request order."""
+    texts = TEXTS * 10
+    with RecordingExecutor() as executor:
+        segmenter = AsyncSegmenter(executor, max_batch_size=8)
+
+        async def main():
+            return await asyncio.gather(*(segmenter.atext_to_words(text) for text in texts))
+
+        results = asyncio.run(main())
+
+    assert results == [text_to_words(text) for text in texts]
+    assert [len(job) for job in executor.jobs] == [8, 8, 8, 8, 8]
+
+
+def test_max_in_flight():
+    """Test no more than max_in_flight requests are queued or running at once."""
+    texts = TEXTS * 5
+    with RecordingExecutor() as executor:
+        executor.released.clear()
+        segmenter = AsyncSegmenter(executor, max_in_flight=3)
+
+        async def main():
+            tasks = [asyncio.create_task(segmenter.atext_to_words(text)) for text in texts]
+            for _ in range(10):
+                await asyncio.sleep(0)
+            num_submitted = sum(len(job) for job in executor.jobs)
+            executor.released.set()
+            return num_submitted, await asyncio.gather(*tasks)
+
+        num_submitted, results = asyncio.run(main())
+
+    assert num_submitted == 3
+    assert results == [text_to_words(text) for text in texts]
+
+
+def test_error_only_fails_its_request():
+    """Test an error in one request of a batch does not fail the others."""
+    segmenter = AsyncSegmenter()
+
+    async def main():
+        return await asyncio.gather(segmenter.atext_to_words("hello world"),
+                                    segmenter.atext_to_words(None),
+                                    segmenter.atext_to_words("hi"),
+                                    return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert results[0] == ["hello ", "world"]
+    assert isinstance(results[1], TypeError | AttributeError)
+    assert results[2] == ["hi"]
+
+
+def test_shut_down_executor_fails_requests():
+    """Test requests to a shut down executor fail, and release their in-flight slots."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+    segmenter = AsyncSegmenter(executor, max_in_flight=2)
+
+    async def main():
+        return await asyncio.gather(*(segmenter.atext_to_words(text) for text in TEXTS), return_exceptions=True)
+
+    results = asyncio.run(asyncio.wait_for(main(), timeout=10))
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_cancelled_jobs_cancel_requests():
+    """Test requests whose executor job is cancelled (shutdown with cancel_futures=True) are cancelled."""
+    with RecordingExecutor() as executor:
+        executor.released.clear()
+        segmenter = AsyncSegmenter(executor, max_batch_size=1)
+
+        async def main():
+            tasks = [asyncio.create_task(segmenter.atext_to_words(text)) for text in TEXTS]
+            await asyncio.sleep(0.1)
+            executor.shutdown(wait=False, cancel_futures=True)
+            executor.released.set()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = asyncio.run(asyncio.wait_for(main(), timeout=10))
+
+    # The executor's two workers already run the first two requests
+    assert results[:2] == [text_to_words(text) for text in TEXTS[:2]]
+    assert all(isinstance(result, asyncio.CancelledError) for result in results[2:])
+
+
+def test_process_executor():
+    """Test segmenting in a process pool."""
+    with ProcessPoolExecutor(max_workers=2, initializer=warmup) as executor:
+        segmenter = AsyncSegmenter(executor)
+
+        async def main():
+            return await asyncio.gather(*(segmenter.atext_to_words(text) for text in TEXTS))
+
+        assert asyncio.run(main()) == [text_to_words(text) for text in TEXTS]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
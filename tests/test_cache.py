@@ -0,0 +1,133 @@
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from words_segmentation.cache import SpanCache, get_cache_dir
+from words_segmentation.pretokenizer import text_to_words
+
+
+class CountingCallback:
+    """Callback that splits into characters and counts how often it is called."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, span):
+        self.calls += 1
+        return list(span)
+
+
+def test_span_cache_hits_and_misses():
+    """Test SpanCache only calls the callback for unseen spans."""
+    cache = SpanCache(max_entries=10)
+    callback = CountingCallback()
+    assert cache.lookup("Chinese", "北京", callback) == ("北", "京")
+    assert cache.lookup("Chinese", "北京", callback) == ("北", "京")
+    assert cache.lookup("Japanese", "北京", callback) == ("北", "京")
+    assert callback.calls == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(cache) == 2
+
+
+def test_span_cache_evicts_least_recently_used():
+    """Test SpanCache evicts the least recently used span when it has too many entries."""
+    cache = SpanCache(max_entries=2)
+    callback = CountingCallback()
+    cache.lookup("Chinese", "一", callback)
+    cache.lookup("Chinese", "二", callback)
+    cache.lookup("Chinese", "一", callback)  # "二" is now the least recently used
+    cache.lookup("Chinese", "三", callback)
+    assert len(cache) == 2
+
+    cache.lookup("Chinese", "一", callback)
+    assert callback.calls == 3
+    cache.lookup("Chinese", "二", callback)
+    assert callback.calls == 4
+
+
+def test_span_cache_byte_budget():
+    """Test SpanCache stays within its memory budget, and skips entries larger than it."""
+    cache = SpanCache(max_entries=1000, max_bytes=2000)
+    callback = CountingCallback()
+    for i in range(100):
+        cache.lookup("Chinese", f"{i}", callback)
+    assert 0 < cache.nbytes <= 2000
+    assert len(cache) < 100
+
+    cache.clear()
+    cache.lookup("Chinese", "字" * 1000, callback)
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_text_to_words_with_cache():
+    """Test text_to_words gives the same words with a cache, reusing repeated spans."""
+    cache = SpanCache()
+    text = "我爱北京天安门 hello 私は学生です"
+    assert text_to_words(text, cache=cache) == text_to_words(text)
+    assert text_to_words(text, cache=cache) == text_to_words(text)
+    # "私" is a one-character Chinese span, which is a single word without a callback or the cache
+    assert cache.misses == 2
+    assert cache.hits == 2
+
+
+def test_span_cache_lookup_many():
+    """Test SpanCache.lookup_many calls the batch callback once, with the distinct spans not cached yet."""
+    cache = SpanCache()
+    calls = []
+
+    def batch_callback(spans):
+        calls.append(spans)
+        return [list(span) for span in spans]
+
+    cache.lookup("Chinese", "北京", list)
+    assert cache.lookup_many("Chinese", ["天安门", "北京", "天安门"], batch_callback) == [
+        ("天", "安", "门"), ("北", "京"), ("天", "安", "门"),
+    ]
+    assert calls == [["天安门"]]
+    assert cache.lookup_many("Chinese", ["北京"], batch_callback) == [("北", "京")]
+    assert len(calls) == 1
+
+
+def test_span_cache_pickle():
+    """Test a pickled SpanCache keeps its limits, but not its entries."""
+    cache = SpanCache(max_entries=10, max_bytes=1000)
+    cache.lookup("Chinese", "北京", list)
+    restored = pickle.loads(pickle.dumps(cache))
+    assert (restored.max_entries, restored.max_bytes) == (10, 1000)
+    assert len(restored) == 0
+    assert restored.lookup("Chinese", "北京", list) == ("北", "京")
+
+
+def test_get_cache_dir(tmp_path, monkeypatch):
+    """Test the persistent cache directory is configurable and created when missing."""
+    monkeypatch.setenv("WORDS_SEGMENTATION_CACHE_DIR", str(tmp_path / "custom"))
+    assert get_cache_dir() == tmp_path / "custom"
+    assert (tmp_path / "custom").is_dir()
+
+    monkeypatch.delenv("WORDS_SEGMENTATION_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert get_cache_dir() == tmp_path / "xdg" / "words_segmentation"
+
+
+
+def test_import_with_unwritable_cache_dir(tmp_path):
+    """Test importing and segmenting text does not create the cache dir, so it works where it can not be written."""
+    env = {key: value for key, value in os.environ.items()
+           if key not in {"XDG_CACHE_HOME", "WORDS_SEGMENTATION_DICTIONARY_DIR"}}
+    # Not even root can create directories in /proc
+    env.update(HOME="/proc/nonexistent", WORDS_SEGMENTATION_CACHE_DIR="/proc/nonexistent/words_segmentation",
+               HF_HOME=str(tmp_path / "huggingface"))
+    script = (
+        "import words_segmentation.pretokenizer, words_segmentation.tokenizer\n"
+        "print(words_segmentation.pretokenizer.text_to_words('hello world'))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True, env=env)
+    assert output.stdout.splitlines() == ["['hello ', 'world']"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,6 +1,14 @@
+import logging
+
 import pytest
 
-from words_segmentation.chinese import has_chinese, segment_chinese
+from words_segmentation.chinese import (
+    get_chinese_segmenter,
+    has_chinese,
+    initialize_chinese_segmenter,
+    segment_chinese,
+    segment_chinese_batch,
+)
 
 
 def test_has_chinese_simple():
@@ -70,5 +78,24 @@ def test_segment_chinese_compound_words():
     assert result == ['中文', '分词', '测试']
 
 
+def test_segment_chinese_batch():
+    """Test segment_chinese_batch segments every text on its own, like segment_chinese."""
+    texts = ["我爱北京天安门", "", "北京", "天安门", "我来到\n北京清华大学", "结束\r", "清华大学 hello"]
+    assert segment_chinese_batch(texts) == [segment_chinese(text) for text in texts]
+    assert segment_chinese_batch(texts[:4]) == [segment_chinese(text) for text in texts[:4]]
+    assert segment_chinese_batch([]) == []
+
+
+def test_initialize_chinese_segmenter_keeps_log_level(monkeypatch, caplog):
+    """Test building jieba's dictionary is not logged, and leaves the level of jieba's logger as it was."""
+    jieba = get_chinese_segmenter()
+    monkeypatch.setattr(jieba.dt, "initialized", False)
+    monkeypatch.setattr(jieba.default_logger, "level", logging.DEBUG)
+    with caplog.at_level(logging.DEBUG, logger="jieba"):
+        assert initialize_chinese_segmenter().dt.initialized
+    assert jieba.default_logger.level == logging.DEBUG
+    assert not [record for record in caplog.records if record.name == "jieba"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
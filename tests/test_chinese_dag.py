@@ -0,0 +1,69 @@
+import importlib.util
+import math
+from pathlib import Path
+
+import pytest
+
+import words_segmentation.chinese_dag as chinese_dag
+from words_segmentation.chinese_dag import get_chinese_dictionary, segment_chinese_batch, segment_chinese_dag
+
+SENTENCES = [
+    "我爱北京天安门",
+    "我来到北京清华大学",
+    "他来到了网易杭研大厦",
+    "小明硕士毕业于中国科学院计算所，后在日本京都大学深造",
+    "团体旅游价格更便宜，所以如果您独自一人或只有一个朋友，请尝试结识其他人并组成一个四到六人的团体。",
+    "AT&T的iPhone 15售价999美元  hello\r\nworld",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def jieba_tokenizer(tmp_path_factory):
+    """
+    A small Chinese dictionary (jieba's entries made of the sentences' characters) in the dictionary dir,
+    and a jieba tokenizer with the same dictionary.
+    """
+    jieba = pytest.importorskip("jieba")
+    characters = set("".join(SENTENCES))
+    jieba_dictionary = Path(importlib.util.find_spec("jieba").submodule_search_locations[0]) / "dict.txt"
+    with open(jieba_dictionary, encoding="utf-8") as f:
+        lines = [line for line in f if set(line.split()[0]) <= characters]
+
+    tmp_path = tmp_path_factory.mktemp("chinese")
+    (tmp_path / "dictionaries").mkdir()
+    (tmp_path / "dictionaries" / "chinese.txt").write_text("".join(lines), encoding="utf-8")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("WORDS_SEGMENTATION_DICTIONARY_DIR", str(tmp_path / "dictionaries"))
+        monkeypatch.setenv("WORDS_SEGMENTATION_CACHE_DIR", str(tmp_path / "cache"))
+        get_chinese_dictionary.cache_clear()
+        yield jieba.Tokenizer(dictionary=str(tmp_path / "dictionaries" / "chinese.txt"))
+        get_chinese_dictionary.cache_clear()
+
+
+def test_segment_chinese_dag_matches_jieba(jieba_tokenizer):
+    """Test the words are the same as jieba.cut's with the same dictionary."""
+    for sentence in SENTENCES:
+        assert segment_chinese_dag(sentence) == list(jieba_tokenizer.cut(sentence))
+
+
+@pytest.mark.parametrize("numpy_min_length", [0, 10 ** 9])
+def test_segment_chinese_batch(jieba_tokenizer, monkeypatch, numpy_min_length):
+    """Test batches give the same words, with routes computed with NumPy or one position at a time."""
+    monkeypatch.setattr(chinese_dag, "_NUMPY_MIN_LENGTH", numpy_min_length)
+    texts = SENTENCES * 3 + ["".join(SENTENCES)]
+    assert segment_chinese_batch(texts) == [list(jieba_tokenizer.cut(text)) for text in texts]
+
+
+def test_chinese_dictionary_values(jieba_tokenizer):
+    """Test the trie holds jieba's log probabilities, and the log probability of an unknown character."""
+    jieba_tokenizer.initialize()
+    trie = get_chinese_dictionary()
+    log_total = math.log(jieba_tokenizer.total)
+    assert trie.get("北京") == math.log(jieba_tokenizer.FREQ["北京"]) - log_total
+    assert trie.get("京北") is None
+    assert trie.values[-1] == -log_total
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,85 @@
+import pickle
+
+import pytest
+
+from words_segmentation.compact import CompactWords
+from words_segmentation.pretokenizer import text_to_words, text_to_words_batch, words_to_text
+
+TEXT = "hello world! 我爱北京天安门 Туры обходятся 👩‍👩‍👧‍👦 \x01"
+
+
+def test_compact_words_sequence():
+    """Test CompactWords behaves like the list of words."""
+    words = text_to_words(TEXT, max_bytes=8)
+    compact = text_to_words(TEXT, max_bytes=8, compact=True)
+    assert isinstance(compact, CompactWords)
+    assert len(compact) == len(words)
+    assert list(compact) == words
+    assert compact == words
+    assert [compact[i] for i in range(-len(words), len(words))] == words + words
+    assert compact[1:5] == words[1:5]
+    assert compact[::-1] == words[::-1]
+    with pytest.raises(IndexError):
+        compact[len(words)]
+
+
+def test_compact_words_round_trip():
+    """Test CompactWords round-trips through words_to_text, and through pickle."""
+    compact = text_to_words(TEXT, compact=True)
+    assert words_to_text(compact) == TEXT
+    assert pickle.loads(pickle.dumps(compact)) == compact
+
+
+def test_compact_words_empty():
+    """Test CompactWords of no words."""
+    compact = text_to_words("", compact=True)
+    assert len(compact) == 0
+    assert list(compact) == []
+    assert words_to_text(compact) == ""
+
+
+def test_compact_words_lone_surrogates():
+    """Test words with lone surrogates are kept as they are."""
+    text = "a\ud800 b \udfff"
+    compact = text_to_words(text, compact=True)
+    assert compact == text_to_words(text)
+    assert list(compact) == list(compact[:]) == text_to_words(text)
+    assert compact.to_text() == text
+    assert pickle.loads(pickle.dumps(compact)) == compact
+
+
+def test_compact_words_memory():
+    """Test CompactWords holds the UTF-8 bytes of the words and a 4-byte offset per word."""
+    compact = CompactWords.from_words(["hello ", "世界"])
+    assert compact.buffer == "hello 世界".encode()
+    assert list(compact.offsets) == [0, 6, 12]
+    assert compact.nbytes == 12 + 3 * 4
+
+
+def test_compact_words_to_numpy():
+    """Test the zero-copy NumPy export."""
+    np = pytest.importorskip("numpy")
+    compact = CompactWords.from_words(["hello ", "世界"])
+    buffer, offsets = compact.to_numpy()
+    assert buffer.dtype == np.uint8
+    assert offsets.tolist() == [0, 6, 12]
+    assert bytes(buffer[offsets[1]:offsets[2]]).decode() == "世界"
+
+
+def test_compact_words_to_arrow():
+    """Test the zero-copy Arrow export."""
+    pytest.importorskip("pyarrow")
+    compact = text_to_words(TEXT, compact=True)
+    assert compact.to_arrow().to_pylist() == list(compact)
+
+
+def test_text_to_words_batch_compact():
+    """Test text_to_words_batch returns CompactWords."""
+    texts = [TEXT, "hello world", ""] * 30
+    results = text_to_words_batch(texts, num_workers=2, chunksize=16, compact=True)
+    assert all(isinstance(words, CompactWords) for words in results)
+    assert results == [text_to_words(text) for text in texts]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,105 @@
+import json
+import math
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from words_segmentation.corpus import read_batches, segment_array, segment_corpus  # noqa: E402
+from words_segmentation.pretokenizer import text_to_words, text_to_words_with_offsets  # noqa: E402
+
+TEXTS = ["hello world", "我爱北京天安门", "すもももももももものうち", "Retket ovat halvempia 👩‍👩‍👧‍👦", None] * 7
+
+
+def _read_output(output_dir) -> "pa.Table":
+    return pq.read_table(sorted(output_dir.glob("part-*.parquet")))
+
+
+@pytest.fixture
+def parquet_corpus(tmp_path):
+    path = tmp_path / "corpus.parquet"
+    pq.write_table(pa.table({"id": list(range(len(TEXTS))), "text": TEXTS}), path)
+    return path
+
+
+def test_segment_array():
+    """Test segmenting an Arrow array into words and byte offsets, keeping nulls."""
+    texts = pa.array(["hello world! 我爱北京天安门", None])
+    words = segment_array(texts, max_bytes=4)
+    assert words.to_pylist() == [text_to_words("hello world! 我爱北京天安门", max_bytes=4), None]
+
+    offsets = segment_array(texts, output="byte_offsets")
+    _, _, expected = text_to_words_with_offsets("hello world! 我爱北京天安门", return_byte_offsets=True)
+    assert offsets.to_pylist() == [[list(offset) for offset in expected], None]
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_segment_corpus_parquet(parquet_corpus, tmp_path, num_workers):
+    """Test segmenting a Parquet corpus into part files, keeping the rows in order."""
+    output_dir = tmp_path / "output"
+    num_rows = segment_corpus(parquet_corpus, output_dir, max_bytes=8, batch_size=4, batches_per_part=3,
+                              num_workers=num_workers)
+    assert num_rows == len(TEXTS)
+    assert len(list(output_dir.glob("part-*.parquet"))) == 3
+
+    table = _read_output(output_dir)
+    assert table.column("id").to_pylist() == list(range(len(TEXTS)))
+    assert table.column("text").to_pylist() == TEXTS
+    assert table.column("text_words").to_pylist() == [
+        None if text is None else text_to_words(text, max_bytes=8) for text in TEXTS
+    ]
+
+
+def test_segment_corpus_jsonl_and_ipc(tmp_path):
+    """Test reading JSONL, Arrow IPC files and Arrow IPC streams gives the same batches."""
+    rows = [{"title": text, "body": text} for text in TEXTS]
+    jsonl_path = tmp_path / "corpus.jsonl"
+    jsonl_path.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+
+    table = pa.Table.from_pylist(rows)
+    ipc_path = tmp_path / "corpus.arrow"
+    with pa.ipc.new_file(ipc_path, table.schema) as writer:
+        writer.write_table(table)
+    stream_path = tmp_path / "corpus.ipc"
+    with pa.ipc.new_stream(stream_path, table.schema) as writer:
+        writer.write_table(table)
+
+    for path in [jsonl_path, ipc_path, stream_path]:
+        assert pa.Table.from_batches(list(read_batches(path, batch_size=4))) == table
+        output_dir = tmp_path / f"output-{path.name}"
+        segment_corpus(path, output_dir, columns=["title", "body"], batch_size=4, num_workers=1)
+        output = _read_output(output_dir)
+        assert output.column("title_words") == output.column("body_words")
+
+
+def test_segment_corpus_resumes(parquet_corpus, tmp_path):
+    """Test parts written by an earlier run are skipped, and settings must not change."""
+    output_dir = tmp_path / "output"
+    segment_corpus(parquet_corpus, output_dir, batch_size=4, batches_per_part=3, num_workers=1)
+    expected = _read_output(output_dir)
+
+    (output_dir / "part-00001.parquet").unlink()
+    (output_dir / "part-00002.parquet").rename(output_dir / "part-00002.parquet.tmp")  # Interrupted
+    assert segment_corpus(parquet_corpus, output_dir, batch_size=4, batches_per_part=3, num_workers=1) == 23
+    assert _read_output(output_dir) == expected
+    assert not list(output_dir.glob("*.tmp"))
+
+    with pytest.raises(ValueError, match="different settings"):
+        segment_corpus(parquet_corpus, output_dir, max_bytes=16, batch_size=4, batches_per_part=3)
+
+
+def test_segment_corpus_byte_offsets(parquet_corpus, tmp_path):
+    """Test writing byte offsets instead of words."""
+    output_dir = tmp_path / "output"
+    segment_corpus(parquet_corpus, output_dir, output="byte_offsets", max_bytes=math.inf, num_workers=1)
+    table = _read_output(output_dir)
+    for text, offsets in zip(TEXTS, table.column("text_byte_offsets").to_pylist(), strict=True):
+        if text is None:
+            assert offsets is None
+        else:
+            assert [text.encode()[start:end].decode() for start, end in offsets] == text_to_words(text)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,97 @@
+import pytest
+
+from words_segmentation.dictionary import get_dictionary, maximal_matching, segment_lao, segment_thai
+from words_segmentation.languages import LANGUAGE_SPECS, Segmenter, dictionary_language_specs, segment_text
+from words_segmentation.trie import DoubleArrayTrie
+
+THAI_WORDS = ["ภาษา", "ภาษาไทย", "ไทย", "เป็น", "ที่", "มี", "ระดับ", "เสียง", "ของ", "คำ"]
+
+
+@pytest.fixture
+def dictionary_dir(tmp_path, monkeypatch):
+    """A dictionary dir with a Thai word list, and an empty cache dir."""
+    monkeypatch.setenv("WORDS_SEGMENTATION_DICTIONARY_DIR", str(tmp_path / "dictionaries"))
+    monkeypatch.setenv("WORDS_SEGMENTATION_CACHE_DIR", str(tmp_path / "cache"))
+    (tmp_path / "dictionaries").mkdir()
+    (tmp_path / "dictionaries" / "thai.txt").write_text("\n".join(THAI_WORDS) + "\n", encoding="utf-8")
+    get_dictionary.cache_clear()
+    yield tmp_path
+    get_dictionary.cache_clear()
+
+
+def test_trie_prefix_ends(tmp_path):
+    """Test finding all dictionary words at a position, before and after saving and memory-mapping the trie."""
+    built = DoubleArrayTrie.build(["a", "ab", "abcd", "b", "日本", "日本語"])
+    built.save(tmp_path / "trie.dat")
+    for trie in [built, DoubleArrayTrie.load(tmp_path / "trie.dat")]:
+        assert trie.prefix_ends(trie.encode("abcde"), 0) == [1, 2, 4]
+        assert trie.prefix_ends(trie.encode("abcde"), 1) == [2]
+        assert trie.prefix_ends(trie.encode("xab"), 0) == []
+        assert trie.prefix_ends(trie.encode("日本語です"), 0) == [2, 3]
+        assert "abcd" in trie
+        assert "abc" not in trie
+        assert "x" not in trie
+
+
+def test_trie_values(tmp_path):
+    """Test word values, and the word indices of prefixes, after saving and memory-mapping the trie."""
+    built = DoubleArrayTrie.build({"ab": 0.5, "a": -1.0, "abc": 2.0})
+    built.save(tmp_path / "trie.dat")
+    for trie in [built, DoubleArrayTrie.load(tmp_path / "trie.dat")]:
+        assert [trie.get(word) for word in ["a", "ab", "abc", "b"]] == [-1.0, 0.5, 2.0, None]
+        assert trie.prefixes(trie.encode("abcd"), 0) == [(1, 0), (2, 1), (3, 2)]
+
+
+def test_trie_large_alphabet():
+    """Test every word of a larger word list is found, and nothing else."""
+    words = [f"{chr(0x0E01 + i % 46)}{chr(0x0E01 + i // 46)}{i % 7}" for i in range(46 * 46)]
+    trie = DoubleArrayTrie.build(words)
+    assert all(word in trie for word in words)
+    assert not any(word[:2] in trie for word in words)
+
+
+def test_maximal_matching():
+    """Test preferring known words, then fewer words, and merging unknown characters."""
+    trie = DoubleArrayTrie.build(THAI_WORDS)
+    assert maximal_matching("ภาษาไทยเป็นภาษาที่มีระดับเสียง", trie) == [
+        "ภาษาไทย", "เป็น", "ภาษา", "ที่", "มี", "ระดับ", "เสียง"
+    ]
+    assert maximal_matching("ฟฟฟภาษาไทยฟฟ", trie) == ["ฟฟฟ", "ภาษาไทย", "ฟฟ"]
+
+
+def test_maximal_matching_grapheme_boundaries():
+    """Test words do not end inside a grapheme cluster."""
+    trie = DoubleArrayTrie.build(["ที", "ี่มี"])
+    assert maximal_matching("ที่มี", trie) == ["ที่มี"]
+
+
+def test_segment_thai(dictionary_dir, monkeypatch):
+    """Test Thai spans are segmented with the word list, and the trie is cached on disk."""
+    monkeypatch.setitem(LANGUAGE_SPECS, "Thai", dictionary_language_specs()["Thai"])
+    assert segment_thai("ภาษาไทยเป็นภาษาที่มี") == ["ภาษาไทย", "เป็น", "ภาษา", "ที่", "มี"]
+    assert len(list((dictionary_dir / "cache" / "tries").glob("thai-*.dat"))) == 1
+
+    words = [word for words in segment_text("hello ภาษาไทย 123") for word in words]
+    assert words == ["hello ", "ภาษาไทย", " ", "123"]
+
+
+def test_segment_without_dictionary(dictionary_dir):
+    """Test a span is kept as one word when its language has no word list."""
+    with pytest.warns(UserWarning, match="No lao word list"):
+        assert segment_lao("ພາສາລາວ") == ["ພາສາລາວ"]
+    assert segment_lao("ພາສາລາວ") == ["ພາສາລາວ"]  # Warns once
+
+
+def test_languages_without_dictionary_stay_default(dictionary_dir, recwarn):
+    """Test languages without a word list get no branch, so their text is split at spaces, without warnings."""
+    specs = dictionary_language_specs()
+    assert "Thai" in specs
+    assert not {"Lao", "Khmer", "Burmese"} & set(specs)
+
+    segmenter = Segmenter({**specs, "Default": LANGUAGE_SPECS["Default"]})
+    assert segmenter.segment_words("ພາສາ ລາວ ภาษาไทย") == ["ພາສາ ", "ລາວ ", "ภาษาไทย"]
+    assert not recwarn.list
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
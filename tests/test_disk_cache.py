@@ -0,0 +1,183 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from words_segmentation.compact import CompactWords
+from words_segmentation.disk_cache import DiskCache, text_key
+from words_segmentation.languages import LANGUAGE_SPECS, Segmenter, text_to_unbound_words
+from words_segmentation.pretokenizer import text_to_words, text_to_words_batch
+
+TEXTS = ["hello world", "北京欢迎你", "こんにちは世界", "hello world", "", "สวัสดีครับ"]
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    cache = DiskCache(tmp_path / "words.sqlite")
+    yield cache
+    cache.close()
+
+
+def test_text_key_depends_on_text_and_config():
+    """Test text keys are 16-byte hashes of both the text and the configuration."""
+    key = text_key("hello", b"config")
+    assert len(key) == 16
+    assert key == text_key("hello", b"config")
+    assert key != text_key("hello", b"other config")
+    assert key != text_key("hellO", b"config")
+    # Moving bytes between the end of the configuration and the start of the text changes the key
+    assert text_key("6abc", b"max_bytes:1") != text_key("abc", b"max_bytes:16")
+
+
+def test_disk_cache_hit_after_miss(disk_cache):
+    """Test words are segmented on the first call, and read from the cache on the next."""
+    expected = text_to_words("hello 北京欢迎你")
+    assert text_to_words("hello 北京欢迎你", disk_cache=disk_cache) == expected
+    assert (disk_cache.hits, disk_cache.misses) == (0, 1)
+    assert text_to_words("hello 北京欢迎你", disk_cache=disk_cache) == expected
+    assert (disk_cache.hits, disk_cache.misses) == (1, 1)
+    assert len(disk_cache) == 1
+
+
+def test_disk_cache_returns_lists_or_compact_words(disk_cache):
+    """Test cached words have the requested type, whatever type they were cached from."""
+    words = text_to_words("hello world", disk_cache=disk_cache)
+    assert isinstance(words, list)
+    compact_words = text_to_words("hello world", compact=True, disk_cache=disk_cache)
+    assert isinstance(compact_words, CompactWords)
+    assert compact_words == words
+    assert disk_cache.hits == 1
+
+
+def test_disk_cache_persists_between_instances(tmp_path):
+    """Test a new DiskCache on the same path reads the words cached by another."""
+    first = DiskCache(tmp_path / "words.sqlite")
+    text_to_words("hello world", disk_cache=first)
+    first.close()
+
+    second = DiskCache(tmp_path / "words.sqlite")
+    assert text_to_words("hello world", disk_cache=second) == ["hello ", "world"]
+    assert (second.hits, second.misses) == (1, 0)
+    second.close()
+
+
+def test_disk_cache_keyed_by_max_bytes(disk_cache):
+    """Test words limited to different max_bytes are cached separately."""
+    assert text_to_words("hello world", max_bytes=4, disk_cache=disk_cache) == ["hell", "o ", "worl", "d"]
+    assert text_to_words("hello world", disk_cache=disk_cache) == ["hello ", "world"]
+    assert (disk_cache.hits, disk_cache.misses) == (0, 2)
+
+
+def test_disk_cache_max_bytes_prefix(disk_cache):
+    """Test a text starting with the digits that extend a max_bytes is not confused with another text."""
+    assert text_to_words("abc", max_bytes=16, disk_cache=disk_cache) == ["abc"]
+    assert text_to_words("6abc", max_bytes=1, disk_cache=disk_cache) == ["6", "a", "b", "c"]
+    assert disk_cache.hits == 0
+
+
+def _characters_batch(spans: list[str]) -> list[list[str]]:
+    return [list(span) for span in spans]
+
+
+def test_disk_cache_keyed_by_segmenter(disk_cache):
+    """Test words of segmenters with different language specs are cached separately."""
+    characters = Segmenter({**LANGUAGE_SPECS, "Chinese": {"scripts": ("Han",), "callback": list}})
+    assert text_to_words("北京欢迎你", disk_cache=disk_cache) == ["北京", "欢迎", "你"]
+    assert text_to_words("北京欢迎你", segmenter=characters, disk_cache=disk_cache) == list("北京欢迎你")
+    assert disk_cache.misses == 2
+
+    batched_characters = Segmenter({**LANGUAGE_SPECS, "Chinese": {**LANGUAGE_SPECS["Chinese"],
+                                                                   "batch_callback": _characters_batch}})
+    assert batched_characters.fingerprint() != Segmenter().fingerprint()
+
+    default_only = Segmenter({"Default": {"scripts": (), "callback": text_to_unbound_words}})
+    assert default_only.fingerprint() != characters.fingerprint()
+    assert Segmenter().fingerprint() == Segmenter(dict(LANGUAGE_SPECS)).fingerprint()
+
+
+def test_disk_cache_batch_matches_uncached(disk_cache):
+    """Test text_to_words_batch with a disk cache returns the same words, including for repeated texts."""
+    expected = text_to_words_batch(TEXTS, num_workers=1)
+    assert text_to_words_batch(TEXTS, num_workers=1, disk_cache=disk_cache) == expected
+    assert len(disk_cache) == len(set(TEXTS))
+    assert text_to_words_batch(TEXTS, num_workers=1, compact=True, disk_cache=disk_cache) == expected
+    assert disk_cache.hits == len(TEXTS)
+
+
+def test_disk_cache_many_keys(disk_cache):
+    """Test lookups of more keys than fit in a single SQLite statement."""
+    texts = [f"text number {i}" for i in range(1200)]
+    expected = [text_to_words(text) for text in texts]
+    assert text_to_words_batch(texts, num_workers=1, chunksize=len(texts), disk_cache=disk_cache) == expected
+    assert text_to_words_batch(texts, num_workers=1, chunksize=len(texts), disk_cache=disk_cache) == expected
+    assert (disk_cache.hits, disk_cache.misses) == (1200, 1200)
+
+
+def test_disk_cache_evicts_oldest(tmp_path):
+    """Test the cache stays under max_bytes by evicting its oldest entries."""
+    disk_cache = DiskCache(tmp_path / "words.sqlite", max_bytes=64 * 1024)
+    texts = [f"text {i} " + "word " * 50 for i in range(2000)]
+    for start in range(0, len(texts), 100):
+        text_to_words_batch(texts[start:start + 100], num_workers=1, disk_cache=disk_cache)
+    assert 0 < len(disk_cache) < len(texts)
+
+    disk_cache.hits = disk_cache.misses = 0
+    text_to_words(texts[-1], disk_cache=disk_cache)
+    text_to_words(texts[0], disk_cache=disk_cache)
+    assert (disk_cache.hits, disk_cache.misses) == (1, 1)
+    disk_cache.close()
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_disk_cache_lone_surrogates(disk_cache, compact):
+    """Test texts with lone surrogates are segmented and cached like any other text."""
+    expected = text_to_words("a\ud800 b")
+    assert text_to_words("a\ud800 b", compact=compact, disk_cache=disk_cache) == expected
+    assert text_to_words("a\ud800 b", compact=compact, disk_cache=disk_cache) == expected
+    assert (disk_cache.hits, disk_cache.misses) == (1, 1)
+
+
+def test_disk_cache_clear(disk_cache):
+    """Test clear removes all entries and resets the counters."""
+    text_to_words("hello", disk_cache=disk_cache)
+    disk_cache.clear()
+    assert len(disk_cache) == 0
+    assert (disk_cache.hits, disk_cache.misses) == (0, 0)
+
+
+def test_disk_cache_pickle(disk_cache):
+    """Test a pickled cache opens the same database, without its counters."""
+    text_to_words("hello", disk_cache=disk_cache)
+    restored = pickle.loads(pickle.dumps(disk_cache))
+    assert (restored.path, restored.max_bytes) == (disk_cache.path, disk_cache.max_bytes)
+    assert (restored.hits, restored.misses) == (0, 0)
+    assert len(restored) == 1
+    restored.close()
+
+
+def _segment_with_cache(disk_cache: DiskCache, start: int) -> list[list[str]]:
+    texts = [f"text {i} 北京欢迎你" for i in range(start, start + 200)]
+    return text_to_words_batch(texts, num_workers=1, chunksize=20, disk_cache=disk_cache)
+
+
+def test_disk_cache_concurrent_processes(disk_cache):
+    """Test processes reading and writing the same cache concurrently, with overlapping texts."""
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(_segment_with_cache, [disk_cache] * 4, [0, 100, 0, 100]))
+    assert results[0] == results[2] == _segment_with_cache(disk_cache, 0)
+    assert results[1] == results[3]
+    assert len(disk_cache) == 300
+    assert disk_cache.misses == 0
+
+
+def test_disk_cache_workers_counters(disk_cache):
+    """Test the hits and misses of worker processes are added to the cache's counters."""
+    texts = [f"text {i} 北京欢迎你" for i in range(40)]
+    expected = text_to_words_batch(texts, num_workers=1)
+    assert text_to_words_batch(texts, num_workers=2, chunksize=10, disk_cache=disk_cache) == expected
+    assert text_to_words_batch(texts, num_workers=2, chunksize=10, disk_cache=disk_cache) == expected
+    assert (disk_cache.hits, disk_cache.misses) == (40, 40)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
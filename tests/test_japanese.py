@@ -1,6 +1,11 @@
 import pytest
 
-from words_segmentation.japanese import has_japanese, segment_japanese
+from words_segmentation.japanese import (
+    get_japanese_tagger,
+    has_japanese,
+    segment_japanese,
+    segment_japanese_batch,
+)
 
 
 def test_has_japanese_hiragana():
@@ -84,5 +89,24 @@ def test_segment_japanese_katakana():
     assert result == ['コンピューター']
 
 
+@pytest.mark.parametrize("text", [
+    "私は学生です",
+    "東京abc かなカナ\n漢字 123",
+    "テスト\u3000",  # Whitespace morphemes at the end are stripped from the wakati output
+    "テスト\u3000 ",
+    "\u3000テスト\u2003スト",
+    " ",
+])
+def test_segment_japanese_matches_nodes(text):
+    """Test segment_japanese gives the surfaces of the tagger's nodes."""
+    assert segment_japanese(text) == [str(word) for word in get_japanese_tagger()(text)]
+
+
+def test_segment_japanese_batch():
+    """Test segment_japanese_batch gives the words of segment_japanese for every text."""
+    texts = ["私は学生です", "", "コンピューター"]
+    assert segment_japanese_batch(texts) == [segment_japanese(text) for text in texts]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
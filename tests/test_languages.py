@@ -0,0 +1,175 @@
+import random
+from itertools import chain
+
+import pytest
+
+from words_segmentation.cache import SpanCache
+from words_segmentation.chinese import get_chinese_segmenter
+from words_segmentation.languages import (
+    LANGUAGE_SPECS,
+    Segmenter,
+    build_regex_from_languages,
+    is_default_only,
+    segment_text,
+    segment_words,
+    segment_words_batch,
+    warmup,
+)
+
+
+def _segment_text_master_regex(text: str) -> list[str]:
+    pat = build_regex_from_languages()
+    return list(chain.from_iterable(LANGUAGE_SPECS[m.lastgroup]["callback"](m.group(0)) for m in pat.finditer(text)))
+
+
+def test_is_default_only():
+    """Test is_default_only detects text without Han, Kana or SignWriting characters."""
+    assert is_default_only("hello world")
+    assert is_default_only("Touren sind für größere Gruppen günstiger.")
+    assert is_default_only("Туры обходятся дешевле עמית 👩‍👩‍👧‍👦")
+    assert is_default_only("")
+    assert not is_default_only("hello 北京")
+    assert not is_default_only("かな")
+    assert not is_default_only("カナ")
+    assert not is_default_only("𝠃𝤛𝤵")
+
+
+@pytest.mark.parametrize("text", [
+    "hello  world!\n\tfoo",
+    "Touren sind für größere Gruppen günstiger.",
+    "é ́x \x01\x02 end",
+    "東京abcかなカナ漢字123 אני אחד私は学生です",
+])
+def test_segment_text_matches_master_regex(text):
+    """Test segment_text gives the same output as the master regex, with or without the fast path."""
+    assert list(chain.from_iterable(segment_text(text))) == _segment_text_master_regex(text)
+
+
+def test_warmup():
+    """Test warmup loads jieba's dictionary, and segmentation is unchanged afterwards."""
+    warmup()
+    assert get_chinese_segmenter().dt.initialized
+    assert list(chain.from_iterable(segment_text("hello 我爱北京天安门"))) == ["hello ", "我", "爱", "北京", "天安门"]
+
+
+@pytest.mark.parametrize("text", [
+    "hello 我爱北京天安门 world",
+    "東京abcかなカナ漢字123 אני אחד私は学生です",
+    "a\u0e31b ภาษาไทย \u0e31x",  # Thai vowel signs after a Latin letter and a space join their grapheme
+    "\u0600中文 \u0600\u0600ไทย",  # Prepend characters join the next character
+    "\x01\u0e31 \r\n\u0e31\x7f中",  # But not after control characters
+    "र्ကa",  # A virama joins the next consonant into a conjunct, even of another script
+    "👩‍👩‍👧‍👦中 😀\u200dไทย 𝠀񀀒񀀚񋚥񋛩𝠃𝤟𝤩 ",
+    "hello 我爱北京天安门 world " * 20,  # Long enough for the script lookup table
+    "",
+])
+def test_segment_words_matches_segment_text(text):
+    """Test segment_words gives the words of segment_text, including where graphemes join across scripts."""
+    assert segment_words(text) == list(chain.from_iterable(segment_text(text)))
+
+
+def test_segment_words_random_texts():
+    """Test segment_words on random texts mixing scripts, marks, whitespace and control characters."""
+    rng = random.Random(0)
+    characters = "ab é\u0301\u0600\x01\r\n\t中文かカไ\u0e31\u0e48ລ\u0eb1ក\u17b6မ\u102c\u200d😀र\u094d"
+    for _ in range(500):
+        text = "".join(rng.choices(characters, k=rng.randint(1, 40)))
+        assert segment_words(text) == list(chain.from_iterable(segment_text(text))), repr(text)
+
+
+def test_segment_words_custom_default_callback():
+    """Test segment_words uses a custom Default callback instead of the fused regex."""
+    specs = {**LANGUAGE_SPECS, "Default": {"scripts": (), "callback": lambda span: [span.upper()]}}
+    assert Segmenter(specs).segment_words("hello 北京 world") == ["HELLO ", "北京", " WORLD"]
+
+
+class CountingBatchCallback:
+    """Batch callback that splits every span into characters, and records the spans of every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, spans):
+        self.calls.append(list(spans))
+        return [list(span) for span in spans]
+
+
+def test_segment_words_batch_coalesces_spans():
+    """Test every language's spans in a batch of texts go to its batch callback in a single call."""
+    batch_callback = CountingBatchCallback()
+    specs = {
+        "Chinese": {"scripts": ("Han",), "callback": list, "batch_callback": batch_callback,
+                    "single_character_words": True},
+        "Default": LANGUAGE_SPECS["Default"],
+    }
+    texts = ["北京 hello 天安门", "hello", "我 爱北京", ""]
+    assert Segmenter(specs).segment_words_batch(texts) == [
+        ["北", "京", " ", "hello ", "天", "安", "门"], ["hello"], ["我", " ", "爱", "北", "京"], [],
+    ]
+    assert batch_callback.calls == [["北京", "天安门", "爱北京"]]  # "我" needs no call
+
+
+def test_segment_words_batch_with_cache():
+    """Test coalesced spans are only segmented once per distinct span that is not cached yet."""
+    batch_callback = CountingBatchCallback()
+    specs = {
+        "Chinese": {"scripts": ("Han",), "callback": list, "batch_callback": batch_callback},
+        "Default": LANGUAGE_SPECS["Default"],
+    }
+    cache = SpanCache()
+    segmenter = Segmenter(specs)
+    assert segmenter.segment_words_batch(["北京 北京 我", "天安门 北京"], cache) == [
+        ["北", "京", " ", "北", "京", " ", "我"], ["天", "安", "门", " ", "北", "京"],
+    ]
+    assert segmenter.segment_words("天安门 北京 上海", cache) == ["天", "安", "门", " ", "北", "京", " ", "上", "海"]
+    assert batch_callback.calls == [["北京", "我", "天安门"], ["上海"]]
+
+
+@pytest.mark.parametrize("text", ["東京abcかなカナ漢字123 私は学生です", "hello 我爱北京天安门 world " * 20])
+def test_segment_words_batch_matches_segment_text(text):
+    """Test the default batch callbacks give the words of segment_text."""
+    texts = [text, "北京", "は", text[::-1]]
+    assert segment_words_batch(texts) == [list(chain.from_iterable(segment_text(text))) for text in texts]
+
+
+def _segment_default(text: str) -> list[str]:
+    return LANGUAGE_SPECS["Default"]["callback"](text)
+
+
+def test_segmenter_with_own_specs():
+    """Test a Segmenter without a Chinese branch segments Han text as Default, side by side with LANGUAGE_SPECS."""
+    specs = {name: spec for name, spec in LANGUAGE_SPECS.items() if name not in ("Chinese", "Japanese")}
+    segmenter = Segmenter(specs)
+    text = "hello 我爱北京天安门 world"
+    assert list(chain.from_iterable(segmenter.segment_text(text))) == ["hello ", "我爱北京天安门 ", "world"]
+    assert list(chain.from_iterable(segment_text(text))) == ["hello ", "我", "爱", "北京", "天安门", " ", "world"]
+    assert segmenter.is_default_only(text)
+    assert not is_default_only(text)
+    # Longer texts are split with the script lookup table
+    assert list(chain.from_iterable(segmenter.segment_text(text * 20))) == _segment_default(text * 20)
+
+
+def test_segmenter_patterns_cached_by_branches():
+    """Test segmenters with the same branches share their compiled pattern."""
+    custom = {"Latin": {"scripts": ("Latin",), "callback": list}, "Default": LANGUAGE_SPECS["Default"]}
+    same = {"Latin": {"scripts": ("Latin",), "callback": str.split}, "Default": LANGUAGE_SPECS["Default"]}
+    assert build_regex_from_languages(custom) is build_regex_from_languages(same)
+    assert build_regex_from_languages(custom) is not build_regex_from_languages()
+    assert list(chain.from_iterable(Segmenter(custom).segment_text("ab 12"))) == ["a", "b", " ", "12"]
+
+
+def test_segmenter_requires_default():
+    """Test a Segmenter without a Default spec is rejected."""
+    with pytest.raises(ValueError, match="Default"):
+        Segmenter({"Chinese": LANGUAGE_SPECS["Chinese"]})
+
+
+def test_language_specs_changes_take_effect(monkeypatch):
+    """Test changes to LANGUAGE_SPECS apply to the default segmenter without clearing any cache."""
+    monkeypatch.setitem(LANGUAGE_SPECS["Chinese"], "scripts", ())
+    monkeypatch.setitem(LANGUAGE_SPECS["Japanese"], "scripts", ())
+    assert list(chain.from_iterable(segment_text("hello 北京"))) == ["hello ", "北京"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from words_segmentation.japanese import get_japanese_tagger, get_japanese_tagger_pool, segment_japanese
+from words_segmentation.pool import InstancePool
+
+
+def test_instance_pool_reuses_instances():
+    """Test InstancePool creates instances on demand, and reuses the last returned one."""
+    pool = InstancePool(object, max_instances=2)
+    with pool.acquire() as first:
+        with pool.acquire() as second:
+            assert first is not second
+        with pool.acquire() as third:
+            assert third is second
+    assert len(pool) == 2
+
+
+def test_instance_pool_is_bounded():
+    """Test concurrent callers never hold more than max_instances instances, and wait for a free one."""
+    pool = InstancePool(object, max_instances=2)
+    in_use = set()
+    max_in_use = 0
+    lock = threading.Lock()
+
+    def use(_):
+        nonlocal max_in_use
+        with pool.acquire() as instance:
+            with lock:
+                assert instance not in in_use
+                in_use.add(instance)
+                max_in_use = max(max_in_use, len(in_use))
+            threading.Event().wait(0.001)
+            with lock:
+                in_use.remove(instance)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(use, range(100)))
+    assert len(pool) == 2
+    assert max_in_use == 2
+
+
+def test_instance_pool_factory_error():
+    """Test a failed factory call does not take a slot in the pool."""
+    calls = []
+
+    def factory():
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("No instance")
+        return object()
+
+    pool = InstancePool(factory, max_instances=1)
+    with pytest.raises(RuntimeError), pool.acquire():
+        pass
+    with pool.acquire() as instance:
+        assert instance is not None
+    assert len(pool) == 1
+
+
+def test_segment_japanese_from_threads():
+    """Test segment_japanese gives the same words from many threads, each with a tagger from the pool."""
+    texts = ["私は学生です", "東京に行きます", "コンピューター", "すもももももももものうち"] * 50
+    expected = [[str(word) for word in get_japanese_tagger()(text)] for text in texts]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(segment_japanese, texts)) == expected
+    pool = get_japanese_tagger_pool()
+    assert 1 <= len(pool) <= pool.max_instances
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,9 +1,21 @@
+import io
+import math
+import multiprocessing
+import subprocess
+import sys
+
 import pytest
 
+from words_segmentation.languages import Segmenter
 from words_segmentation.pretokenizer import (
     is_word_complete,
+    iter_words,
+    segment_batch,
     text_to_words,
+    text_to_words_batch,
+    text_to_words_with_offsets,
     utf8_chunks_grapheme_safe,
+    utf8_chunks_grapheme_safe_batch,
 )
 
 
@@ -189,5 +201,157 @@ def test_is_word_complete_unicode_with_space():
     assert not is_word_complete("こんにちは")
 
 
+def test_text_to_words_batch_matches_serial():
+    """Test text_to_words_batch returns the same words, in input order, as text_to_words."""
+    texts = ["hello world", "我爱北京天安门", "私は学生です", "", "עמית מוריוסף 👋"] * 20
+    expected = [text_to_words(text, max_bytes=8) for text in texts]
+    assert text_to_words_batch(texts, max_bytes=8, num_workers=2, chunksize=8) == expected
+
+
+def test_text_to_words_batch_single_worker():
+    """Test text_to_words_batch without a process pool."""
+    assert text_to_words_batch(["hello world", "hi"], num_workers=1) == [["hello ", "world"], ["hi"]]
+    assert text_to_words_batch([]) == []
+
+
+def test_text_to_words_batch_preload():
+    """Test text_to_words_batch with segmenters loaded before starting the workers."""
+    texts = ["hello world", "我爱北京天安门", "すもももももももものうち"] * 8
+    expected = [text_to_words(text) for text in texts]
+    assert text_to_words_batch(texts, num_workers=2, chunksize=4, preload=True) == expected
+
+
+_set_in_parent = False
+
+
+def _parent_state_words(text: str) -> list[str]:
+    return [f"{text}:{_set_in_parent}"]
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="Needs the fork start method")
+def test_text_to_words_batch_preload_forks_workers(monkeypatch):
+    """Test preloaded workers are forked, sharing the parent's state, even where spawn is the default."""
+    monkeypatch.setattr(sys.modules[__name__], "_set_in_parent", True)
+    segmenter = Segmenter({"Default": {"scripts": (), "callback": _parent_state_words}})
+    start_method = multiprocessing.get_start_method()
+    multiprocessing.set_start_method("spawn", force=True)
+    try:
+        preloaded = text_to_words_batch(["a", "b"], num_workers=2, chunksize=1, preload=True, segmenter=segmenter)
+        spawned = text_to_words_batch(["a", "b"], num_workers=2, chunksize=1, segmenter=segmenter)
+    finally:
+        multiprocessing.set_start_method(start_method, force=True)
+    assert preloaded == [["a:True"], ["b:True"]]
+    assert spawned == [["a:False"], ["b:False"]]
+
+
+_STREAM_SAMPLE = "hello  world! 東京abcかなカナ漢字123 אני אחד私は学生です 👩‍👩‍👧‍👦 é ́x\r\n\x01end"
+
+
+def test_iter_words_matches_text_to_words_at_every_split():
+    """Test iter_words gives the same words as text_to_words, wherever the text is split into chunks."""
+    expected = text_to_words(_STREAM_SAMPLE)
+    for i in range(len(_STREAM_SAMPLE) + 1):
+        chunks = [_STREAM_SAMPLE[:i], _STREAM_SAMPLE[i:]]
+        assert list(iter_words(chunks)) == expected, f"split at {i}"
+
+
+def test_iter_words_single_character_chunks():
+    """Test iter_words with the smallest possible chunks."""
+    assert list(iter_words(iter(_STREAM_SAMPLE))) == text_to_words(_STREAM_SAMPLE)
+    assert list(iter_words(iter(_STREAM_SAMPLE), max_bytes=4)) == text_to_words(_STREAM_SAMPLE, max_bytes=4)
+
+
+def test_iter_words_file_objects():
+    """Test iter_words reading from text and binary UTF-8 files."""
+    expected = text_to_words(_STREAM_SAMPLE, max_bytes=8)
+    assert list(iter_words(io.StringIO(_STREAM_SAMPLE), max_bytes=8, chunk_size=3)) == expected
+    # Binary chunks split in the middle of multi-byte characters
+    binary = io.BytesIO(_STREAM_SAMPLE.encode("utf-8"))
+    assert list(iter_words(binary, max_bytes=8, chunk_size=5)) == expected
+
+
+def test_iter_words_empty():
+    """Test iter_words with empty input."""
+    assert list(iter_words([])) == []
+    assert list(iter_words(io.StringIO(""))) == []
+
+
+def test_text_to_words_with_offsets():
+    """Test text_to_words_with_offsets returns the same words, with their character and byte spans."""
+    text = "hello עמית! 東京abcかなカナ漢字123 我爱北京天安门 👩‍👩‍👧‍👦"
+    for max_bytes in (math.inf, 4, 10):
+        words, offsets, byte_offsets = text_to_words_with_offsets(text, max_bytes=max_bytes, return_byte_offsets=True)
+        assert words == text_to_words(text, max_bytes=max_bytes)
+        assert [text[start:end] for start, end in offsets] == words
+        encoded = text.encode("utf-8")
+        assert [encoded[start:end].decode("utf-8") for start, end in byte_offsets] == words
+
+
+def test_text_to_words_with_offsets_skipped_characters():
+    """Test offsets stay aligned when a callback drops characters from its span."""
+    text = "a 𝣴𝣵 b"  # Incomplete SignWriting, not returned by the SignWriting callback
+    words, offsets, byte_offsets = text_to_words_with_offsets(text, return_byte_offsets=True)
+    assert words == ["a ", " ", "b"]
+    assert offsets == [(0, 2), (4, 5), (5, 6)]
+    assert byte_offsets == [(0, 2), (10, 11), (11, 12)]
+    assert text_to_words_with_offsets(text)[2] is None
+
+
+def test_utf8_chunks_code_points():
+    """Test utf8_chunks_grapheme_safe on text where every code point is its own grapheme cluster."""
+    assert list(utf8_chunks_grapheme_safe("абвгд", max_bytes=5)) == ["аб", "вг", "д"]
+    assert list(utf8_chunks_grapheme_safe("𝐀𝐁", max_bytes=3)) == ["𝐀", "𝐁"]
+    assert list(utf8_chunks_grapheme_safe("a\r\nbcd", max_bytes=2)) == ["a", "\r\n", "bc", "d"]
+    assert list(utf8_chunks_grapheme_safe("", max_bytes=2)) == [""]
+
+
+def test_utf8_chunks_grapheme_safe_batch():
+    """Test utf8_chunks_grapheme_safe_batch gives the same chunks as chunking every word separately."""
+    words = ["hi ", "hello world", "עמית מוריוסף", "👩‍👩‍👧‍👦", "நண்பருடனோ", "a\r\n", "ε"]
+    for max_bytes in (1, 4, 8, 16):
+        expected = [chunk for word in words for chunk in utf8_chunks_grapheme_safe(word, max_bytes=max_bytes)]
+        assert list(utf8_chunks_grapheme_safe_batch(words, max_bytes=max_bytes)) == expected
+
+
+def test_is_word_complete_control_whitespace():
+    """Test is_word_complete with control tokens that are also whitespace."""
+    assert is_word_complete("\x1c")
+    assert is_word_complete("hello\x1c")
+    assert not is_word_complete("\x1chello ")
+    assert not is_word_complete("hello world ")
+
+
+def test_segment_batch():
+    """Test segment_batch returns words, and optionally byte offsets, for a batch column."""
+    batch = {"text": ["hello world", None, "北京"]}
+    assert segment_batch(batch) == {"words": [["hello ", "world"], None, ["北京"]]}
+    assert segment_batch(batch, max_bytes=3, return_byte_offsets=True) == {
+        "words": [["hel", "lo ", "wor", "ld"], None, ["北", "京"]],
+        "byte_offsets": [[(0, 3), (3, 6), (6, 9), (9, 11)], None, [(0, 3), (3, 6)]],
+    }
+
+
+def test_control_tokens_pattern_matches_utf8_tokenizer():
+    """The control tokens pattern, kept locally for fast imports, is the same as utf8_tokenizer's."""
+    from utf8_tokenizer.control import CONTROl_TOKENS_PATTERN
+
+    from words_segmentation.control import CONTROL_TOKENS_PATTERN
+    assert CONTROL_TOKENS_PATTERN == CONTROl_TOKENS_PATTERN
+
+
+def test_import_without_torch():
+    """Text segmentation does not import torch or transformers, and WordStoppingCriteria imports them lazily."""
+    script = (
+        "import sys\n"
+        "from words_segmentation.pretokenizer import text_to_words\n"
+        "text_to_words('hello world')\n"
+        "print(sorted({'torch', 'transformers', 'utf8_tokenizer'} & set(sys.modules)))\n"
+        "from words_segmentation.pretokenizer import WordStoppingCriteria\n"
+        "print('torch' in sys.modules)\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    assert output.splitlines() == ["[]", "True"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from words_segmentation.languages import _explicit_branches, build_regex_from_languages, iter_spans
+from words_segmentation.scripts import script_runs
+
+pytest.importorskip("numpy")
+
+# Characters of every branch, and characters that join grapheme clusters across branches
+CHARACTERS = list("ab 1.,\n\r\t") + [
+    "\r\n", "́", "゙", "〪", "‍", "؀", "\U000110bd", "🇯🇵", "👩‍👩‍👧", "😀", "️",
+    "漢", "北京", "か", "カ", "ー", "、", "。", "ｱ", "ﾞ", "〽", "㐀", "\U00020000",
+    "\U0001d800", "\U0001da9b", "\U0001daa1", "\U00040012", "한", "ᄀ", "ᅡ", "क", "्", "\x01", "\x7f",
+]
+
+
+def _master_regex_spans(text: str) -> list[tuple[str, int, int]]:
+    return [(m.lastgroup, m.start(), m.end()) for m in build_regex_from_languages().finditer(text)]
+
+
+def test_script_runs_match_master_regex():
+    """Test script_runs gives the same spans as the master regex, or None, on random texts."""
+    rng = random.Random(0)
+    num_runs = 0
+    for _ in range(2000):
+        text = "".join(rng.choice(CHARACTERS) for _ in range(rng.randint(1, 40)))
+        runs = script_runs(text, *_explicit_branches())
+        if runs is not None:
+            assert runs == _master_regex_spans(text), text
+            num_runs += 1
+    assert num_runs > 200  # Not only fallbacks
+
+
+@pytest.mark.parametrize("text", [
+    "hello 我爱北京天安门，すもももももももものうち。" * 20,
+    "𝠀񀀒񀀚񋚥񋛩𝠃𝤟𝤩񋛩𝣵𝤐񀀒𝤇𝣤񋚥𝤐𝤆񀀚𝣮𝣭 hello " * 20,
+    "東京abcかなカナ漢字123 אני אחד私は学生です\n" * 20,
+])
+def test_script_runs_long_texts(text):
+    """Test script_runs on texts long enough for iter_spans to use it."""
+    assert script_runs(text, *_explicit_branches()) == _master_regex_spans(text)
+    assert list(iter_spans(text)) == _master_regex_spans(text)
+
+
+def test_script_runs_cluster_across_default_span():
+    """Test a Default grapheme cluster continuing with an explicit-script character falls back to the regex."""
+    text = "a゙かな " * 100  # The voiced sound mark (Hiragana/Katakana) extends the cluster of "a"
+    assert script_runs(text, *_explicit_branches()) is None
+    assert list(iter_spans(text)) == _master_regex_spans(text)
+    assert _master_regex_spans(text)[0] == ("Default", 0, 2)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,120 @@
+import json
+import math
+import pickle
+
+import pytest
+
+from words_segmentation.languages import LANGUAGE_SPECS, Segmenter
+from words_segmentation.tokenizer import WordsSegmentationTokenizer
+
+
+def test_tokenize():
+    """Test WordsSegmentationTokenizer splits text into words."""
+    tokenizer = WordsSegmentationTokenizer()
+    assert tokenizer.tokenize("hello world! 我爱北京天安门") == ['hello ', 'world! ', '我', '爱', '北京', '天安门']
+
+
+def test_tokenize_offsets_mapping():
+    """Test WordsSegmentationTokenizer returns character offsets with return_offsets_mapping."""
+    tokenizer = WordsSegmentationTokenizer(max_bytes=4)
+    text = "hello 北京"
+    tokens, offsets = tokenizer.tokenize(text, return_offsets_mapping=True)
+    assert tokens == tokenizer.tokenize(text)
+    assert tokens == ['hell', 'o ', '北', '京']
+    assert offsets == [(0, 4), (4, 6), (6, 7), (7, 8)]
+
+
+def test_batch_tokenize():
+    """Test WordsSegmentationTokenizer.batch_tokenize keeps input order and max_bytes."""
+    tokenizer = WordsSegmentationTokenizer(max_bytes=4)
+    texts = ["hello world", "我爱北京天安门", "私は学生です"] * 10
+    assert tokenizer.batch_tokenize(texts, num_workers=2, chunksize=4) == [tokenizer.tokenize(text) for text in texts]
+
+
+def test_tokenize_span_cache():
+    """Test WordsSegmentationTokenizer enables the span cache through kwargs."""
+    assert WordsSegmentationTokenizer().span_cache is None
+
+    tokenizer = WordsSegmentationTokenizer(span_cache_size=100)
+    tokens = tokenizer.tokenize("我爱北京天安门")
+    assert tokenizer.tokenize("我爱北京天安门") == tokens
+    assert (tokenizer.span_cache.hits, tokenizer.span_cache.misses) == (1, 1)
+
+
+def test_tokenize_with_segmenter():
+    """Test WordsSegmentationTokenizer segments with its own Segmenter's language specs."""
+    specs = {name: spec for name, spec in LANGUAGE_SPECS.items() if name not in ("Chinese", "Japanese")}
+    tokenizer = WordsSegmentationTokenizer(segmenter=Segmenter(specs))
+    text = "hello world! 我爱北京天安门"
+    assert tokenizer.tokenize(text) == ['hello ', 'world! ', '我爱北京天安门']
+    assert tokenizer.tokenize(text, return_offsets_mapping=True)[1] == [(0, 6), (6, 13), (13, 20)]
+    assert tokenizer.batch_tokenize([text] * 3, num_workers=1) == [tokenizer.tokenize(text)] * 3
+    assert WordsSegmentationTokenizer().tokenize(text)[-1] == "天安门"
+
+
+def test_batch_segment():
+    """Test WordsSegmentationTokenizer.batch_segment segments a batch column with max_bytes."""
+    tokenizer = WordsSegmentationTokenizer(max_bytes=4)
+    batch = {"text": ["hello world", "我爱北京天安门"], "id": [0, 1]}
+    assert tokenizer.batch_segment(batch) == {"words": [tokenizer.tokenize(text) for text in batch["text"]]}
+
+    result = tokenizer.batch_segment({"title": ["hello 北京"]}, column="title", return_byte_offsets=True)
+    assert result == {"words": [['hell', 'o ', '北', '京']], "byte_offsets": [[(0, 4), (4, 6), (6, 9), (9, 12)]]}
+
+
+def _strict_json_load(path):
+    """Parse JSON, rejecting the NaN and Infinity constants that Python's json module accepts."""
+    def reject(constant):
+        raise ValueError(f"Invalid JSON constant: {constant}")
+
+    with open(path, encoding="utf-8") as f:
+        return json.load(f, parse_constant=reject)
+
+
+def test_save_and_pickle_keep_settings(tmp_path):
+    """Test max_bytes and the span cache settings survive save_pretrained and pickling."""
+    tokenizer = WordsSegmentationTokenizer(max_bytes=8, span_cache_size=100)
+    tokenizer.tokenize("我爱北京天安门")
+
+    tokenizer.save_pretrained(tmp_path)
+    assert _strict_json_load(tmp_path / "tokenizer_config.json")["max_bytes"] == 8
+    for restored in [WordsSegmentationTokenizer.from_pretrained(tmp_path), pickle.loads(pickle.dumps(tokenizer))]:
+        assert restored.max_bytes == 8
+        assert restored.span_cache.max_entries == 100
+        assert restored.tokenize("hello world! 我爱北京天安门") == tokenizer.tokenize("hello world! 我爱北京天安门")
+
+
+def test_save_default_tokenizer(tmp_path):
+    """Test the default (unlimited) max_bytes is saved as valid JSON, and restored as unlimited."""
+    tokenizer = WordsSegmentationTokenizer()
+    tokenizer.save_pretrained(tmp_path)
+    assert _strict_json_load(tmp_path / "tokenizer_config.json")["max_bytes"] is None
+    for restored in [WordsSegmentationTokenizer.from_pretrained(tmp_path), pickle.loads(pickle.dumps(tokenizer))]:
+        assert restored.max_bytes == math.inf
+        assert restored.span_cache is None
+        assert restored.tokenize("a" * 100) == ["a" * 100]
+
+
+def test_datasets_map(tmp_path):
+    """Test batch_segment in datasets.Dataset.map with num_proc, reusing the cache on a second run."""
+    datasets = pytest.importorskip("datasets")
+    tokenizer = WordsSegmentationTokenizer(max_bytes=4, span_cache_size=100)
+    texts = ["hello world", "我爱北京天安门", "私は学生です"] * 4
+    datasets.Dataset.from_dict({"text": texts}).to_parquet(tmp_path / "data.parquet")
+
+    def map_dataset():
+        dataset = datasets.load_dataset("parquet", data_files=str(tmp_path / "data.parquet"),
+                                        cache_dir=str(tmp_path / "cache"), split="train")
+        return dataset.map(tokenizer.batch_segment, batched=True, batch_size=4, num_proc=2,
+                           fn_kwargs={"return_byte_offsets": True})
+
+    dataset = map_dataset()
+    assert dataset["words"] == [tokenizer.tokenize(text) for text in texts]
+    assert dataset["byte_offsets"][1] == [[0, 3], [3, 6], [6, 9], [9, 12], [12, 15], [15, 18], [18, 21]]
+
+    tokenizer.tokenize("天安门")  # Filling the span cache does not change the fingerprint
+    assert map_dataset().cache_files == dataset.cache_files
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
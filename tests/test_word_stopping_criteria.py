@@ -1,7 +1,7 @@
 import pytest
 import torch
 
-from words_segmentation.pretokenizer import WordStoppingCriteria
+from words_segmentation.pretokenizer import WordStoppingCriteria, is_word_complete
 
 
 class MockTokenizer:
@@ -147,5 +147,109 @@ def test_word_stopping_criteria_utf8_tokenizer():
     assert result.shape == (2,)
 
 
+def _generate_step_by_step(criteria, tokenizer, sequences, prompt_length=0):
+    """Call the criteria after every generated token, comparing it with is_word_complete on the full decoding."""
+    input_ids = torch.tensor(sequences)
+    scores = torch.zeros((len(sequences), 100))
+    for length in range(prompt_length + 1, input_ids.shape[1] + 1):
+        result = criteria(input_ids[:, :length], scores)
+        texts = tokenizer.batch_decode(input_ids[:, prompt_length:length].tolist())
+        assert result.tolist() == [is_word_complete(text) for text in texts], f"length {length}"
+
+
+def test_word_stopping_criteria_incremental_matches_full_decode():
+    """Test the incremental criteria matches decoding the whole sequence at every step."""
+    tokenizer = MockTokenizer()
+    sequences = [
+        [104, 101, 108, 108, 111, 32, 119, 32],  # "hello w "
+        [1, 104, 105, 32, 32, 32, 32, 32],  # "\x01hi     "
+        [32, 104, 105, 32, 104, 105, 32, 32],  # " hi hi  "
+    ]
+    _generate_step_by_step(WordStoppingCriteria(tokenizer), tokenizer, sequences)
+
+
+def test_word_stopping_criteria_incremental_multibyte_utf8():
+    """Test the incremental criteria with byte tokens that split multi-byte characters."""
+    from utf8_tokenizer.tokenizer import UTF8Tokenizer
+
+    tokenizer = UTF8Tokenizer()
+    texts = ["שלום ", "👩‍👩‍👧‍👦 ", "héllo wörld"]
+    encoded = [list(text.encode("utf-8")) for text in texts]
+    max_len = max(len(ids) for ids in encoded)
+    sequences = [ids + [32] * (max_len - len(ids)) for ids in encoded]
+    _generate_step_by_step(WordStoppingCriteria(tokenizer), tokenizer, sequences)
+
+
+def test_word_stopping_criteria_prompt_length():
+    """Test the prompt is neither decoded nor part of the word."""
+    tokenizer = MockTokenizer()
+    prompt = [104, 105, 32, 32]  # "hi  "
+    sequences = [prompt + [104, 101, 121, 32], prompt + [1, 1, 1, 1]]
+    criteria = WordStoppingCriteria(tokenizer, prompt_length=len(prompt))
+    _generate_step_by_step(criteria, tokenizer, sequences, prompt_length=len(prompt))
+    assert criteria(torch.tensor(sequences), torch.zeros((2, 100))).tolist() == [True, False]
+
+
+def test_word_stopping_criteria_resets_on_new_batch():
+    """Test the criteria can be reused across generations."""
+    tokenizer = MockTokenizer()
+    criteria = WordStoppingCriteria(tokenizer)
+    scores = torch.zeros((1, 100))
+    assert criteria(torch.tensor([[104, 105, 32, 104]]), scores).tolist() == [False]
+    assert criteria(torch.tensor([[104, 105, 32]]), scores).tolist() == [True]
+    assert criteria(torch.tensor([[104, 105, 32], [104, 105, 105]]), torch.zeros((2, 100))).tolist() == [True, False]
+
+
+@pytest.mark.parametrize("byte_level", [False, True])
+def test_word_stopping_criteria_reused_with_longer_sequences(byte_level, monkeypatch):
+    """
+    Test a reused criteria resets for new sequences of the same batch size that are longer than the last,
+    by itself, or with reset() in byte-level mode, which never compares token ids on the host.
+    """
+    if byte_level:
+        monkeypatch.setattr(torch, "equal", None)
+    tokenizer = MockTokenizer()
+    reused = WordStoppingCriteria(tokenizer, byte_level=byte_level)
+    scores = torch.zeros((2, 100))
+    reused(torch.tensor([[97, 32], [97, 32]]), scores)  # "a "
+    if byte_level:
+        reused.reset()
+    input_ids = torch.tensor([[104, 101, 108, 108, 111], [104, 101, 108, 108, 111]])  # "hello"
+    assert reused(input_ids, scores).tolist() == [False, False]
+    input_ids = torch.tensor([[104, 101, 108, 108, 111, 104], [104, 101, 108, 108, 111, 32]])  # "helloh", "hello "
+    assert reused(input_ids, scores).tolist() == [False, True]
+    assert reused(input_ids, scores).tolist() == WordStoppingCriteria(tokenizer, byte_level=byte_level)(
+        input_ids, scores).tolist()
+
+
+@pytest.mark.parametrize("prompt_length", [0, 3])
+def test_word_stopping_criteria_byte_level_matches_full_decode(prompt_length):
+    """Test the device-side byte-level check matches is_word_complete on the decoded text at every step."""
+    from utf8_tokenizer.tokenizer import UTF8Tokenizer
+
+    tokenizer = UTF8Tokenizer()
+    pieces = ["a", "é", "👋", " ", "\t", "　", "\xa0", " ", "\x01", "\x1c", "\n"]
+    generator = torch.Generator().manual_seed(0)
+    sequences = []
+    for _ in range(64):
+        indices = torch.randint(len(pieces), (6,), generator=generator).tolist()
+        prompt = "hi "[:prompt_length]
+        sequences.append(list((prompt + "".join(pieces[i] for i in indices)).encode("utf-8")))
+    length = min(len(ids) for ids in sequences)
+    sequences = [ids[:length] for ids in sequences]
+
+    criteria = WordStoppingCriteria(tokenizer, prompt_length=prompt_length, byte_level=True)
+    _generate_step_by_step(criteria, tokenizer, sequences, prompt_length=prompt_length)
+
+
+def test_word_stopping_criteria_byte_level_examples():
+    """Test the byte-level check on simple words."""
+    texts = ["hello ", "hello", "hello world ", "\x01", "  ", "שלום　"]
+    for text in texts:
+        criteria = WordStoppingCriteria(tokenizer=None, byte_level=True)
+        input_ids = torch.tensor([list(text.encode("utf-8"))])
+        assert criteria(input_ids, torch.zeros((1, 100))).tolist() == [is_word_complete(text)], text
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
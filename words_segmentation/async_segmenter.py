@@ -0,0 +1,123 @@
+"""
+Async segmentation, for calling the pretokenizer from an asyncio service.
+
+Segmentation is CPU-bound (most of all jieba and MeCab on long CJK texts), so it runs in an executor
+instead of blocking the event loop. Requests made concurrently are micro-batched into one executor job,
+and the number of requests in flight is bounded, so under load callers wait for a slot
+instead of queueing unbounded work.
+"""
+
+import asyncio
+import math
+import weakref
+from collections.abc import Callable
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any
+
+from words_segmentation.languages import segment_text
+from words_segmentation.pretokenizer import text_to_words
+
+
+def _segment_text(text: str) -> list[list[str]]:
+    return [list(words) for words in segment_text(text)]
+
+
+def _run_batch(calls: list[tuple[Callable[[str], Any], str]]) -> list[Any]:
+    return [func(text) for func, text in calls]
+
+
+def _fail(batch: list[tuple[Callable[[str], Any], str, asyncio.Future]], error: BaseException):
+    for _, _, future in batch:
+        if not future.done():  # The caller may have been cancelled
+            future.set_exception(error)
+
+
+class AsyncSegmenter:
+    """
+    Segments texts in an executor: the event loop's default thread pool, or the given thread or process pool
+    (for a ProcessPoolExecutor, pass initializer=warmup to load the language segmenters in every worker).
+
+    Requests made in the same event loop iteration are sent to the executor together,
+    in batches of at most max_batch_size texts.
+    At most max_in_flight requests are queued or running; further requests wait for one to finish.
+    An instance is bound to the event loop it is first used in.
+    """
+
+    def __init__(self, executor: Executor | None = None, max_in_flight: int = 256, max_batch_size: int = 32):
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._pending: list[tuple[Callable[[str], Any], str, asyncio.Future]] = []
+        self._flush_scheduled = False
+
+    async def asegment_text(self, text: str) -> list[list[str]]:
+        """Like segment_text, returning the words of every span."""
+        return await self._submit(_segment_text, text)
+
+    async def atext_to_words(self, text: str, max_bytes: int = math.inf) -> list[str]:
+        """Like text_to_words."""
+        return await self._submit(partial(text_to_words, max_bytes=max_bytes), text)
+
+    async def _submit(self, func: Callable[[str], Any], text: str) -> Any:
+        async with self._in_flight:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending.append((func, text, future))
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                loop.call_soon(self._flush, loop)
+            return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop):
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, []
+        for i in range(0, len(pending), self.max_batch_size):
+            self._run(loop, pending[i:i + self.max_batch_size])
+
+    def _run(self, loop: asyncio.AbstractEventLoop, batch: list[tuple[Callable[[str], Any], str, asyncio.Future]]):
+        try:
+            job = loop.run_in_executor(self.executor, _run_batch, [(func, text) for func, text, _ in batch])
+        except RuntimeError as error:  # The executor is shut down
+            _fail(batch, error)
+            return
+        job.add_done_callback(partial(self._resolve, loop, batch))
+
+    def _resolve(self, loop: asyncio.AbstractEventLoop, batch: list, job: asyncio.Future):
+        if job.cancelled():  # E.g. the executor was shut down with cancel_futures=True
+            for _, _, future in batch:
+                future.cancel()
+            return
+        if job.exception() is not None:
+            if len(batch) > 1:
+                # Run every request on its own, so an error only fails the request that raised it
+                for request in batch:
+                    self._run(loop, [request])
+                return
+            _fail(batch, job.exception())
+            return
+
+        for (_, _, future), result in zip(batch, job.result(), strict=True):
+            if not future.done():  # The caller may have been cancelled
+                future.set_result(result)
+
+
+_default_segmenters: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncSegmenter] = \
+    weakref.WeakKeyDictionary()
+
+
+def _default_segmenter() -> AsyncSegmenter:
+    loop = asyncio.get_running_loop()
+    if loop not in _default_segmenters:
+        _default_segmenters[loop] = AsyncSegmenter()
+    return _default_segmenters[loop]
+
+
+async def asegment_text(text: str) -> list[list[str]]:
+    """segment_text in the event loop's default executor, micro-batched with concurrent requests."""
+    return await _default_segmenter().asegment_text(text)
+
+
+async def atext_to_words(text: str, max_bytes: int = math.inf) -> list[str]:
+    """text_to_words in the event loop's default executor, micro-batched with concurrent requests."""
+    return await _default_segmenter().atext_to_words(text, max_bytes=max_bytes)
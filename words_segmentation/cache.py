@@ -0,0 +1,112 @@
+"""
+Bounded LRU cache for language callback results.
+
+Real corpora (chat logs, UI strings, templated titles) repeat the same Chinese/Japanese spans again and again.
+Caching the segmented words by span text makes a repeated span cost a dict lookup instead of a jieba or MeCab call.
+Segmenters keep their own persistent caches (like jieba's prefix dictionary) in get_cache_dir().
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from pathlib import Path
+
+
+def get_cache_dir(create: bool = True) -> Path:
+    """
+    Directory for persistent caches (e.g. jieba's prefix dictionary), created if missing (unless create=False,
+    for only looking files up in it).
+    $WORDS_SEGMENTATION_CACHE_DIR, or words_segmentation under $XDG_CACHE_HOME (default ~/.cache).
+    """
+    cache_dir = os.environ.get("WORDS_SEGMENTATION_CACHE_DIR")
+    if cache_dir is None:
+        cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        cache_dir = Path(cache_home) / "words_segmentation"
+    cache_dir = Path(cache_dir)
+    if create:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def _words_size(span: str, words: tuple[str, ...]) -> int:
+    """Approximate memory held by a cache entry, in bytes."""
+    return sys.getsizeof(span) + sys.getsizeof(words) + sum(sys.getsizeof(word) for word in words)
+
+
+class SpanCache:
+    """
+    Least-recently-used cache from (language, span) to the callback's words.
+    Bounded both by the number of entries and by the approximate memory they hold.
+    """
+
+    def __init__(self, max_entries: int = 2 ** 16, max_bytes: int = 64 * 2 ** 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries: OrderedDict[Hashable, tuple[tuple[str, ...], int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: Hashable) -> tuple[str, ...] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def _put(self, key: Hashable, words: Iterable[str]) -> tuple[str, ...]:
+        words = tuple(words)
+        size = _words_size(key[1], words)
+        if size > self.max_bytes:
+            return words
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (words, size)
+                self.nbytes += size
+                while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self.nbytes -= evicted_size
+        return words
+
+    def lookup(self, language: str, span: str, callback: Callable[[str], Iterable[str]]) -> tuple[str, ...]:
+        """Return the cached words for span, calling callback(span) on a miss."""
+        key = (language, span)
+        words = self._get(key)
+        return self._put(key, callback(span)) if words is None else words
+
+    def lookup_many(self, language: str, spans: list[str],
+                    batch_callback: Callable[[list[str]], Iterable[Iterable[str]]]) -> list[tuple[str, ...]]:
+        """Return the cached words for every span, calling batch_callback once with the distinct missing spans."""
+        cached = {span: self._get((language, span)) for span in dict.fromkeys(spans)}
+        missing = [span for span, words in cached.items() if words is None]
+        if missing:
+            for span, words in zip(missing, batch_callback(missing), strict=True):
+                cached[span] = self._put((language, span), words)
+        return [cached[span] for span in spans]
+
+    def __getstate__(self) -> dict:
+        # Only the limits: the lock can not be pickled, and cached entries and counters are per process.
+        # This also keeps the pickled state (e.g. datasets fingerprints) the same as the cache fills.
+        return {"max_entries": self.max_entries, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.nbytes = 0
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}(entries={len(self)}, nbytes={self.nbytes}, "
+                f"hits={self.hits}, misses={self.misses})")
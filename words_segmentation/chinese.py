@@ -5,10 +5,14 @@ This module provides functions for detecting and segmenting Chinese text using t
 library for word segmentation.
 """
 
+import logging
+from contextlib import contextmanager
 from functools import cache
 
 import regex
 
+from words_segmentation.cache import get_cache_dir
+
 
 def has_chinese(text: str) -> bool:
     """
@@ -37,6 +41,8 @@ def get_chinese_segmenter():
     Jieba is a popular Chinese text segmentation library that uses a combination of
     dictionary-based matching and statistical models to segment Chinese text into words.
     The segmenter is cached to avoid repeated initialization overhead.
+    Its prefix dictionary is built lazily, from a persistent on-disk cache (see get_cache_dir),
+    or eagerly with initialize_chinese_segmenter() (see warmup).
 
     Returns:
         jieba module instance for text segmentation
@@ -50,6 +56,32 @@ def get_chinese_segmenter():
         print("Error: jieba library not found. Please install it with: pip install jieba")
         raise
 
+    # Keep the prefix dictionary cache across runs, instead of in the temporary directory
+    if jieba.dt.tmp_dir is None:
+        jieba.dt.tmp_dir = str(get_cache_dir())
+    return jieba
+
+
+@contextmanager
+def _quiet_logger(logger: logging.Logger):
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+
+def initialize_chinese_segmenter():
+    """
+    The jieba segmenter, with its prefix dictionary built.
+    Jieba logs every dictionary build to the console, so its logger is quiet while building,
+    and keeps the level the application set otherwise.
+    """
+    jieba = get_chinese_segmenter()
+    if not jieba.dt.initialized:
+        with _quiet_logger(jieba.default_logger):
+            jieba.dt.initialize()
     return jieba
 
 
@@ -71,8 +103,26 @@ def segment_chinese(text: str) -> list[str]:
         >>> segment_chinese("我爱北京天安门")
         "我 爱 北京 天安门"
     """
-    jieba = get_chinese_segmenter()
+    jieba = initialize_chinese_segmenter()
     # Use jieba.cut() for precise segmentation and join with spaces
     segments = jieba.cut(text)
     # Filter out empty segments and join with single spaces
     return list(segments)
+
+
+def segment_chinese_batch(texts: list[str]) -> list[list[str]]:
+    """
+    Segment many Chinese texts like segment_chinese, with a single jieba.cut call.
+    Texts are joined with newlines, which jieba never joins to a word, so every text is segmented on its own.
+    """
+    if any("\n" in text or "\r" in text for text in texts):
+        return [segment_chinese(text) for text in texts]
+
+    jieba = initialize_chinese_segmenter()
+    results = [[]]
+    for word in jieba.cut("\n".join(texts)):
+        if word == "\n":
+            results.append([])
+        else:
+            results[-1].append(word)
+    return results[:len(texts)]
@@ -0,0 +1,224 @@
+"""
+Chinese word segmentation without jieba's startup cost (an alternative to chinese.segment_chinese).
+
+Jieba builds its prefix dictionary as a Python dict in every process (about a second, and tens of MB),
+then finds the words of a sentence (a DAG) and the most probable route through them in pure Python.
+Here, the same dictionary is compiled once into a memory-mapped double-array trie of log frequencies
+(see trie.DoubleArrayTrie), and the DAG and route are computed with NumPy, over many spans at once.
+
+The output is jieba.cut's (precise mode, with HMM): the same words, route and tie-breaking, and runs of
+single characters that are not a dictionary word go through jieba's HMM (jieba.finalseg), loaded only then.
+The route is the same floating point computation as jieba's, so results differ only for custom dictionaries
+or words added to jieba at runtime (see benchmarks/chinese_backends.py for the agreement on a reference corpus).
+
+To use it for Chinese spans:
+    LANGUAGE_SPECS["Chinese"]["callback"] = segment_chinese_dag
+    LANGUAGE_SPECS["Chinese"]["batch_callback"] = segment_chinese_batch
+"""
+
+import importlib.util
+import math
+from collections.abc import Iterable
+from functools import cache
+from pathlib import Path
+
+import regex
+
+from words_segmentation.dictionary import get_dictionary_dir
+from words_segmentation.trie import DoubleArrayTrie, load_cached_trie
+
+# jieba.cut's blocks: runs of these characters are segmented, other characters are single words
+_BLOCK_PATTERN = regex.compile(r"([一-鿕a-zA-Z0-9+#&\._%\-]+)")
+_SKIP_PATTERN = regex.compile(r"(\r\n|\s)")
+
+
+def find_chinese_dictionary() -> Path:
+    """chinese.txt in the dictionary dir (see dictionary.get_dictionary_dir), or jieba's bundled dict.txt."""
+    path = get_dictionary_dir() / "chinese.txt"
+    if path.exists():
+        return path
+
+    # Only locate the package's data file, without importing jieba
+    spec = importlib.util.find_spec("jieba")
+    for location in (spec.submodule_search_locations or []) if spec else []:
+        path = Path(location) / "dict.txt"
+        if path.exists():
+            return path
+    raise FileNotFoundError("No Chinese dictionary found. Please install jieba with: pip install jieba")
+
+
+def read_frequency_dictionary(path: str | Path) -> tuple[dict[str, float], float]:
+    """
+    Read a jieba dictionary ("word frequency [tag]" lines) into the log probabilities of its words,
+    and the log probability of a character that is not a word, as jieba computes them.
+    """
+    frequencies = {}
+    total = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            word, frequency = line.split()[:2]
+            frequencies[word] = int(frequency)
+            total += int(frequency)
+    log_total = math.log(total)
+    # Words with frequency 0 are not in jieba's DAG
+    return {word: math.log(frequency) - log_total for word, frequency in frequencies.items() if frequency}, -log_total
+
+
+def _build_chinese_trie(path: Path) -> DoubleArrayTrie:
+    log_probabilities, unknown_log_probability = read_frequency_dictionary(path)
+    trie = DoubleArrayTrie.build(log_probabilities)
+    trie.values.append(unknown_log_probability)  # After the words' values
+    return trie
+
+
+@cache
+def get_chinese_dictionary() -> DoubleArrayTrie:
+    """
+    The trie of the Chinese dictionary's log probabilities, built on first use and cached on disk
+    (see trie.load_cached_trie). The value after the words' values is the log probability of an unknown character.
+    """
+    path = find_chinese_dictionary()
+    return load_cached_trie("chinese", path, lambda: _build_chinese_trie(path))
+
+
+# Below this many characters in a batch, the routes are faster to compute without NumPy
+_NUMPY_MIN_LENGTH = 256
+
+
+def _route(trie: DoubleArrayTrie, block: str) -> list[int]:
+    """Jieba's route for a block (see _routes), one position at a time like jieba.Tokenizer.calc."""
+    values = trie.values
+    unknown = values[-1]
+    codes = trie.encode(block)
+    route = [0.0] * (len(block) + 1)
+    lengths = [1] * len(block)
+    for start in range(len(block) - 1, -1, -1):
+        candidates = [(values[index] + route[end], end) for end, index in trie.prefixes(codes, start)]
+        route[start], end = max(candidates) if candidates else (unknown + route[start + 1], start + 1)
+        lengths[start] = end - start
+    return lengths
+
+
+def _routes(trie: DoubleArrayTrie, blocks: list[str]) -> list[list[int]]:
+    """
+    For every block, jieba's route: the length of the word starting at each position of the most probable route.
+    All blocks are concatenated, with a separator after each one (a character that is not in any word).
+    """
+    if sum(map(len, blocks)) < _NUMPY_MIN_LENGTH:
+        return [_route(trie, block) for block in blocks]
+
+    import numpy as np
+
+    base = np.frombuffer(trie.base, dtype=np.int32)
+    check = np.frombuffer(trie.check, dtype=np.int32)
+    values = np.frombuffer(trie.values, dtype=np.float64)
+
+    codes = np.array(trie.encode("\0".join(blocks) + "\0"), dtype=np.int64)
+    size = len(codes)
+    block_ends = np.cumsum([len(block) + 1 for block in blocks]) - 1
+
+    # The DAG: walk the trie from every position at once, one character deeper at a time,
+    # keeping the log probability of the word (of length depth + 1) that ends at each depth
+    weights = []
+    positions = np.arange(size)
+    states = np.zeros(size, dtype=np.int64)
+    while positions.size:
+        depth = len(weights)
+        targets = base[states] + codes[np.minimum(positions + depth, size - 1)]
+        found = check[targets] == states
+        positions, states = positions[found], targets[found]
+        terminals = base[states]
+        is_word = check[terminals] == states
+        weight = np.full(size, -np.inf)
+        weight[positions[is_word]] = values[base[terminals[is_word]]]
+        weights.append(weight)
+    weights = np.stack(weights[:-1] or [np.full(size, -np.inf)], axis=1)
+    # A position without words has its single character, with the log probability of an unknown character
+    weights[np.isneginf(weights).all(axis=1), 0] = values[-1]
+
+    # The route, from the end of every block backwards: every step updates the positions at the same distance
+    # from their block's end, with the best word and the route after it (ties go to the longest word)
+    max_length = weights.shape[1]
+    distances = block_ends[np.searchsorted(block_ends, np.arange(size))] - np.arange(size)
+    order = np.argsort(distances, kind="stable")
+    bounds = np.searchsorted(distances[order], np.arange(distances.max() + 2))
+    route = np.zeros(size + max_length)
+    lengths = np.zeros(size, dtype=np.int64)
+    offsets = np.arange(1, max_length + 1)
+    for distance in range(1, len(bounds) - 1):
+        indices = order[bounds[distance]:bounds[distance + 1]]
+        candidates = (weights[indices] + route[indices[:, None] + offsets])[:, ::-1]
+        best = np.argmax(candidates, axis=1)
+        route[indices] = candidates[np.arange(len(indices)), best]
+        lengths[indices] = max_length - best
+
+    lengths = lengths.tolist()
+    routes = []
+    start = 0
+    for block in blocks:
+        routes.append(lengths[start:start + len(block)])
+        start += len(block) + 1
+    return routes
+
+
+def _cut_route(block: str, lengths: list[int], trie: DoubleArrayTrie) -> Iterable[str]:
+    """Jieba's words of a block along its route, with runs of single characters through the HMM."""
+    buffer_start = None
+    position = 0
+    while position <= len(block):
+        end = position + lengths[position] if position < len(block) else None
+        if end == position + 1:
+            buffer_start = position if buffer_start is None else buffer_start
+        else:
+            if buffer_start is not None:
+                buffer = block[buffer_start:position]
+                if len(buffer) == 1 or buffer in trie:
+                    yield from buffer
+                else:
+                    from jieba import finalseg  # Only loaded for runs of unknown characters
+
+                    yield from finalseg.cut(buffer)
+                buffer_start = None
+            if end is None:
+                break
+            yield block[position:end]
+        position = end
+
+
+def _split_blocks(text: str) -> list[tuple[bool, str]]:
+    """Jieba's blocks of a text, and whether each one is segmented with the dictionary."""
+    blocks = []
+    for block in _BLOCK_PATTERN.split(text):
+        if _BLOCK_PATTERN.fullmatch(block):
+            blocks.append((True, block))
+        elif block:
+            blocks.append((False, block))
+    return blocks
+
+
+def segment_chinese_batch(texts: list[str]) -> list[list[str]]:
+    """Segment many Chinese texts like jieba.cut, computing the routes of all their blocks at once."""
+    trie = get_chinese_dictionary()
+    texts_blocks = [_split_blocks(text) for text in texts]
+    segmented_blocks = [block for blocks in texts_blocks for is_segmented, block in blocks if is_segmented]
+    routes = iter(_routes(trie, segmented_blocks) if segmented_blocks else [])
+
+    results = []
+    for blocks in texts_blocks:
+        words = []
+        for is_segmented, block in blocks:
+            if is_segmented:
+                words.extend(_cut_route(block, next(routes), trie))
+            else:
+                for piece in _SKIP_PATTERN.split(block):
+                    if _SKIP_PATTERN.fullmatch(piece):
+                        words.append(piece)
+                    else:
+                        words.extend(piece)
+        results.append(words)
+    return results
+
+
+def segment_chinese_dag(text: str) -> list[str]:
+    """Segment Chinese text like chinese.segment_chinese (jieba.cut), without loading jieba's dictionary."""
+    return segment_chinese_batch([text])[0]
@@ -0,0 +1,93 @@
+"""
+Compact storage of segmented words: one contiguous UTF-8 buffer, and the byte offset where every word starts.
+
+A list of words costs a str object (~50 bytes of overhead) and a list pointer per word, which dominates memory
+when keeping large pre-segmented corpora around. CompactWords costs the word's UTF-8 bytes and a 4-byte offset,
+and decodes words only when accessed.
+
+Lone surrogates (which Python strings may hold) are kept with the "surrogatepass" error handler,
+so such buffers are not valid UTF-8, and can not be exported to_arrow.
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import accumulate, pairwise
+
+
+class CompactWords(Sequence):
+    """
+    Read-only sequence of words, backed by a UTF-8 buffer and an array of len(words) + 1 byte offsets
+    (int32, or int64 for buffers of 2 GiB or more), laid out like an Arrow string array.
+    """
+
+    __slots__ = ("buffer", "offsets")
+
+    def __init__(self, buffer: bytes, offsets: array):
+        self.buffer = buffer
+        self.offsets = offsets
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "CompactWords":
+        encoded = [word.encode("utf-8", "surrogatepass") for word in words]
+        buffer = b"".join(encoded)
+        typecode = "i" if len(buffer) < 2 ** 31 else "q"
+        return cls(buffer, array(typecode, accumulate(map(len, encoded), initial=0)))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("CompactWords index out of range")
+        return str(memoryview(self.buffer)[self.offsets[index]:self.offsets[index + 1]], "utf-8", "surrogatepass")
+
+    def __iter__(self) -> Iterator[str]:
+        view = memoryview(self.buffer)
+        for start, end in pairwise(self.offsets):
+            yield str(view[start:end], "utf-8", "surrogatepass")
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactWords):
+            return self.buffer == other.buffer and self.offsets == other.offsets
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return self.__class__, (self.buffer, self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the buffer and the offsets."""
+        return len(self.buffer) + self.offsets.itemsize * len(self.offsets)
+
+    def to_text(self) -> str:
+        """The concatenated words (like words_to_text), decoded at once."""
+        return self.buffer.decode("utf-8", "surrogatepass")
+
+    def to_numpy(self):
+        """Zero-copy (buffer, offsets) NumPy arrays, of uint8 and int32/int64."""
+        import numpy as np
+
+        return np.frombuffer(self.buffer, dtype=np.uint8), np.frombuffer(self.offsets, dtype=self.offsets.typecode)
+
+    def to_arrow(self):
+        """Zero-copy Arrow string array (large_string for int64 offsets). Requires words without lone surrogates."""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            print("Error: pyarrow library not found. Please install it with: pip install pyarrow")
+            raise
+
+        arrow_type = pa.string() if self.offsets.typecode == "i" else pa.large_string()
+        buffers = [None, pa.py_buffer(self.offsets), pa.py_buffer(self.buffer)]
+        return pa.Array.from_buffers(arrow_type, len(self), buffers)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self)!r})"
@@ -0,0 +1,6 @@
+"""
+Control tokens, as defined by utf8_tokenizer.control.
+Kept here, since importing utf8_tokenizer imports torch and transformers, which segmentation does not need.
+"""
+
+CONTROL_TOKENS_PATTERN = "\x01-\x08\x0e-\x1f\x7f"
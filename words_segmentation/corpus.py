@@ -0,0 +1,254 @@
+"""
+Segment the text columns of a corpus (Parquet, Arrow IPC or JSONL) into Parquet files, streaming.
+
+Record batches are segmented in parallel worker processes, with a bounded number of batches in flight,
+and written in input order to part files in the output directory. Every part file is renamed into place
+only once complete, so an interrupted run resumes from the last complete part.
+
+    python -m words_segmentation.corpus corpus.parquet output/ --columns text --max-bytes 16
+"""
+
+import argparse
+import json
+import math
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from functools import partial
+from itertools import islice
+from pathlib import Path
+
+from words_segmentation.languages import warmup
+from words_segmentation.pretokenizer import text_to_words, text_to_words_with_offsets
+
+_INPUT_FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "ipc",
+    ".ipc": "ipc",
+    ".feather": "ipc",
+    ".jsonl": "jsonl",
+    ".json": "jsonl",
+}
+_CHECKPOINT_FILE = "_checkpoint.json"
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError:
+        print("Error: pyarrow library not found. Please install it with: pip install 'words-segmentation[corpus]'")
+        raise
+    return pa
+
+
+def _read_jsonl_batches(path: Path, batch_size: int) -> Iterator:
+    pa = _import_pyarrow()
+    schema = None
+    with open(path, encoding="utf-8") as f:
+        lines = (line for line in f if line.strip())
+        while rows := [json.loads(line) for line in islice(lines, batch_size)]:
+            batch = pa.RecordBatch.from_pylist(rows, schema=schema)
+            schema = batch.schema  # Later batches keep the types inferred from the first one
+            yield batch
+
+
+def read_batches(path: str | Path, batch_size: int = 8192, input_format: str | None = None) -> Iterator:
+    """Stream the record batches of a Parquet, Arrow IPC (file or stream) or JSONL file."""
+    pa = _import_pyarrow()
+    path = Path(path)
+    input_format = input_format or _INPUT_FORMATS.get(path.suffix.lower())
+    if input_format == "parquet":
+        import pyarrow.parquet as pq
+
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+    elif input_format == "ipc":
+        try:
+            reader = pa.ipc.open_file(path)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            batches = pa.ipc.open_stream(path)
+        for batch in batches:
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+    elif input_format == "jsonl":
+        yield from _read_jsonl_batches(path, batch_size)
+    else:
+        raise ValueError(f"Unknown input format for {path}, expected one of {sorted(set(_INPUT_FORMATS.values()))}")
+
+
+def _byte_offsets(text: str, max_bytes: int) -> list[tuple[int, int]]:
+    return text_to_words_with_offsets(text, max_bytes=max_bytes, return_byte_offsets=True)[2]
+
+
+def segment_array(texts, max_bytes: int = math.inf, output: str = "words"):
+    """
+    Segment an Arrow string array, into a list<string> array of words,
+    or (output="byte_offsets") a list<fixed_size_list<int32, 2>> array of the words' (start, end) UTF-8 offsets.
+    Null texts stay null.
+    """
+    pa = _import_pyarrow()
+    if output == "words":
+        segment, arrow_type = partial(text_to_words, max_bytes=max_bytes), pa.list_(pa.string())
+    elif output == "byte_offsets":
+        segment, arrow_type = partial(_byte_offsets, max_bytes=max_bytes), pa.list_(pa.list_(pa.int32(), 2))
+    else:
+        raise ValueError(f"Unknown output {output!r}, expected 'words' or 'byte_offsets'")
+    return pa.array([None if text is None else segment(text) for text in texts.to_pylist()], type=arrow_type)
+
+
+def _segment_columns(columns: dict, max_bytes: int, output: str) -> dict:
+    return {name: segment_array(texts, max_bytes=max_bytes, output=output) for name, texts in columns.items()}
+
+
+def _map_ordered(executor, func, items: Iterable[tuple], max_in_flight: int) -> Iterator[tuple]:
+    """
+    For (context, arg) items, yield (context, func(arg)) in input order,
+    with at most max_in_flight args submitted to the executor at once.
+    """
+    if executor is None:
+        for context, arg in items:
+            yield context, func(arg)
+        return
+
+    in_flight = deque()
+    for context, arg in items:
+        in_flight.append((context, executor.submit(func, arg)))
+        if len(in_flight) >= max_in_flight:
+            context, future = in_flight.popleft()
+            yield context, future.result()
+    while in_flight:
+        context, future = in_flight.popleft()
+        yield context, future.result()
+
+
+def _check_checkpoint(output_dir: Path, settings: dict):
+    """Record the settings of the run, and refuse to resume a run with different settings."""
+    checkpoint = output_dir / _CHECKPOINT_FILE
+    if checkpoint.exists():
+        previous = json.loads(checkpoint.read_text())
+        if previous != settings:
+            raise ValueError(f"{output_dir} has parts written with different settings: {previous}, "
+                             f"remove it to start over")
+    else:
+        checkpoint.write_text(json.dumps(settings, indent=2))
+
+
+def _part_path(output_dir: Path, part: int) -> Path:
+    return output_dir / f"part-{part:05d}.parquet"
+
+
+class _PartWriter:
+    """Writes record batches to Parquet part files, each renamed into place once complete."""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.part = None
+        self._writer = None
+
+    def write(self, part: int, batch):
+        import pyarrow.parquet as pq
+
+        if part != self.part:
+            self.close()
+            self.part = part
+            self._writer = pq.ParquetWriter(f"{_part_path(self.output_dir, part)}.tmp", batch.schema)
+        self._writer.write_batch(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(f"{_part_path(self.output_dir, self.part)}.tmp", _part_path(self.output_dir, self.part))
+            self._writer = None
+
+
+def _pending_batches(input_path: str | Path,
+                     output_dir: Path,
+                     columns: list[str],
+                     batch_size: int,
+                     batches_per_part: int,
+                     input_format: str | None) -> Iterator[tuple]:
+    """Batches of the parts that are not written yet, with only their text columns to send to workers."""
+    for i, batch in enumerate(read_batches(input_path, batch_size=batch_size, input_format=input_format)):
+        part = i // batches_per_part
+        if not _part_path(output_dir, part).exists():
+            yield (part, batch), {name: batch.column(name) for name in columns}
+
+
+def segment_corpus(input_path: str | Path,
+                   output_dir: str | Path,
+                   columns: Iterable[str] = ("text",),
+                   max_bytes: int = math.inf,
+                   output: str = "words",
+                   batch_size: int = 8192,
+                   batches_per_part: int = 16,
+                   num_workers: int | None = None,
+                   input_format: str | None = None) -> int:
+    """
+    Segment the text columns of a corpus, adding a `{column}_{output}` column for every text column,
+    and write the rows to Parquet part files of batches_per_part record batches in output_dir.
+    Parts written by an earlier run with the same settings are skipped.
+    Returns the number of rows written by this run.
+    """
+    _import_pyarrow()
+    columns = list(columns)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    _check_checkpoint(output_dir, {
+        "input": str(input_path),
+        "columns": columns,
+        "max_bytes": None if max_bytes == math.inf else max_bytes,
+        "output": output,
+        "batch_size": batch_size,
+        "batches_per_part": batches_per_part,
+    })
+
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    executor = None
+    if num_workers > 1:
+        from concurrent.futures import ProcessPoolExecutor  # Imports multiprocessing, only needed here
+
+        executor = ProcessPoolExecutor(max_workers=num_workers, initializer=warmup)
+
+    batches = _pending_batches(input_path, output_dir, columns, batch_size, batches_per_part, input_format)
+    segment = partial(_segment_columns, max_bytes=max_bytes, output=output)
+    writer = _PartWriter(output_dir)
+    num_rows = 0
+    try:
+        for (part, batch), segmented in _map_ordered(executor, segment, batches, 2 * num_workers):
+            for name in columns:
+                batch = batch.append_column(f"{name}_{output}", segmented[name])
+            writer.write(part, batch)
+            num_rows += batch.num_rows
+        writer.close()  # Only a part that was completely written is renamed into place
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return num_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Parquet, Arrow IPC or JSONL file")
+    parser.add_argument("output_dir", help="Directory for the Parquet part files")
+    parser.add_argument("--columns", nargs="+", default=["text"], help="Text columns to segment")
+    parser.add_argument("--max-bytes", type=lambda v: math.inf if v == "inf" else int(v), default=math.inf,
+                        help="Split words longer than this many UTF-8 bytes ('inf' for no limit)")
+    parser.add_argument("--output", choices=["words", "byte_offsets"], default="words",
+                        help="Write the words (list<string>), or their (start, end) UTF-8 byte offsets")
+    parser.add_argument("--input-format", choices=sorted(set(_INPUT_FORMATS.values())),
+                        help="Input format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=8192, help="Rows per record batch")
+    parser.add_argument("--batches-per-part", type=int, default=16, help="Record batches per output part file")
+    parser.add_argument("--num-workers", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    num_rows = segment_corpus(args.input, args.output_dir, columns=args.columns, max_bytes=args.max_bytes,
+                              output=args.output, batch_size=args.batch_size,
+                              batches_per_part=args.batches_per_part, num_workers=args.num_workers,
+                              input_format=args.input_format)
+    print(f"Segmented {num_rows:,} rows into {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
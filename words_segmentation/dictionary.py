@@ -0,0 +1,137 @@
+"""
+Dictionary-based segmentation for scripts written without spaces between words (Thai, Lao, Khmer, Burmese).
+
+Spans are segmented by maximal matching: the fewest unknown grapheme clusters, then the fewest words,
+over the words of a word list, looked up in a double-array trie (see trie.DoubleArrayTrie).
+The trie is built once per word list, cached in get_cache_dir(), and memory-mapped lazily on first use.
+
+Word lists are plain text files, one word per line (anything after a tab is ignored), found at:
+- <dictionary dir>/<language>.txt, where the dictionary dir is $WORDS_SEGMENTATION_DICTIONARY_DIR
+  (default: dictionaries in get_cache_dir())
+- For Thai, the word list bundled with PyThaiNLP (pip install pythainlp), if installed.
+Languages are only given a branch in LANGUAGE_SPECS when their word list is found (see
+languages.dictionary_language_specs); called directly without one, a span is kept as one word, with a warning.
+"""
+
+import importlib.util
+import os
+import warnings
+from functools import cache
+from pathlib import Path
+
+import regex
+
+from words_segmentation.cache import get_cache_dir
+from words_segmentation.trie import DoubleArrayTrie, load_cached_trie
+
+_GRAPHEME_PATTERN = regex.compile(r"\X")
+
+
+def get_dictionary_dir() -> Path:
+    """Directory of <language>.txt word lists, $WORDS_SEGMENTATION_DICTIONARY_DIR or dictionaries in the cache dir."""
+    dictionary_dir = os.environ.get("WORDS_SEGMENTATION_DICTIONARY_DIR")
+    # Only looked up (e.g. when importing languages), so the cache dir is not created
+    return Path(dictionary_dir) if dictionary_dir else get_cache_dir(create=False) / "dictionaries"
+
+
+def find_word_list(language: str) -> Path | None:
+    """The word list file of a language (e.g. "thai"), or None if there is none."""
+    path = get_dictionary_dir() / f"{language}.txt"
+    if os.path.isfile(path):  # False for unreadable dirs too
+        return path
+
+    if language == "thai":
+        # Only locate the package's data file, without importing PyThaiNLP
+        spec = importlib.util.find_spec("pythainlp")
+        for location in (spec.submodule_search_locations or []) if spec else []:
+            path = Path(location) / "corpus" / "words_th.txt"
+            if path.exists():
+                return path
+    return None
+
+
+def read_word_list(path: str | Path) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [word for line in f if (word := line.split("\t", 1)[0].strip())]
+
+
+@cache
+def get_dictionary(language: str) -> DoubleArrayTrie | None:
+    """
+    The trie of a language's word list, built on first use and cached on disk (see trie.load_cached_trie).
+    None (with a warning) if the language has no word list.
+    """
+    path = find_word_list(language)
+    if path is None:
+        warnings.warn(f"No {language} word list found in {get_dictionary_dir()}, "
+                      f"{language} text is not segmented into words", stacklevel=2)
+        return None
+
+    return load_cached_trie(language, path, lambda: DoubleArrayTrie.build(read_word_list(path)))
+
+
+def maximal_matching(text: str, trie: DoubleArrayTrie) -> list[str]:
+    """
+    Segment text into dictionary words, minimizing the number of unknown grapheme clusters, then of words.
+    Words only end at grapheme cluster boundaries, and consecutive unknown clusters are merged into one word.
+    """
+    cluster_ends = [m.end() for m in _GRAPHEME_PATTERN.finditer(text)]
+    next_boundary = dict(zip([0] + cluster_ends, cluster_ends, strict=False))
+
+    # Dynamic programming over cluster boundaries: a cost of (unknown clusters, words), as one integer,
+    # and back pointers to the previous boundary (negative for unknown clusters)
+    codes = trie.encode(text)
+    unknown_cost = len(text) + 1
+    best = {0: 0}
+    back = {}
+    for start, cluster_end in next_boundary.items():
+        cost = best[start] + 1
+        for end in trie.prefix_ends(codes, start):
+            if end in next_boundary or end == len(text):
+                if cost < best.get(end, unknown_cost * unknown_cost):
+                    best[end] = cost
+                    back[end] = start
+        if cost + unknown_cost < best.get(cluster_end, unknown_cost * unknown_cost):
+            best[cluster_end] = cost + unknown_cost
+            back[cluster_end] = -start - 1
+
+    words = []
+    end = len(text)
+    unknown_end = None
+    while end > 0:
+        start = back[end]
+        if start < 0:
+            start = -start - 1
+            unknown_end = unknown_end or end
+            if back.get(start, 0) >= 0:  # The first of consecutive unknown clusters
+                words.append(text[start:unknown_end])
+                unknown_end = None
+        else:
+            words.append(text[start:end])
+        end = start
+    words.reverse()
+    return words
+
+
+def segment_dictionary(language: str, text: str) -> list[str]:
+    """Segment a span of a language with its word list, or keep it as one word without one."""
+    trie = get_dictionary(language)
+    if trie is None or not text:
+        return [text] if text else []
+    return maximal_matching(text, trie)
+
+
+def segment_thai(text: str) -> list[str]:
+    return segment_dictionary("thai", text)
+
+
+def segment_lao(text: str) -> list[str]:
+    return segment_dictionary("lao", text)
+
+
+def segment_khmer(text: str) -> list[str]:
+    return segment_dictionary("khmer", text)
+
+
+def segment_burmese(text: str) -> list[str]:
+    return segment_dictionary("burmese", text)
@@ -0,0 +1,153 @@
+"""
+Persistent cache of segmented texts, shared between runs and processes.
+
+Pipelines re-segment the same documents on every training run and max_bytes experiment.
+With a DiskCache, text_to_words looks up a text's words by a hash of the text and of everything its segmentation
+depends on (see Segmenter.fingerprint, and max_bytes), so re-runs over an unchanged corpus read instead of segmenting.
+
+Entries are CompactWords buffers in a SQLite database (in get_cache_dir() by default), in WAL mode:
+any number of processes read concurrently while one writes, and writers wait for each other up to timeout seconds.
+When the database grows over max_bytes, its oldest entries are evicted.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+
+from words_segmentation.cache import get_cache_dir
+from words_segmentation.compact import CompactWords
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    key BLOB NOT NULL UNIQUE,
+    buffer BLOB NOT NULL,
+    offsets BLOB NOT NULL,
+    size INTEGER NOT NULL
+)
+"""
+_MAX_PARAMETERS = 500  # Per statement, well under SQLite's limit
+
+# The first entry (by insertion order) where the entries up to it hold at least the given bytes
+_EVICTION_BOUND_QUERY = """
+SELECT rowid FROM (SELECT rowid, SUM(size) OVER (ORDER BY rowid) AS total FROM words) WHERE total >= ? LIMIT 1
+"""
+
+
+def text_key(text: str, config: bytes) -> bytes:
+    """A 16-byte hash of a text and of the configuration it is segmented with."""
+    # The configuration is hashed separately, as the key, so no text can be confused with the end of a configuration
+    config_key = hashlib.blake2b(config, digest_size=32).digest()
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16, key=config_key).digest()
+
+
+def _decode(buffer: bytes, offsets: bytes) -> CompactWords:
+    words_offsets = array("i" if len(buffer) < 2 ** 31 else "q")
+    words_offsets.frombytes(offsets)
+    return CompactWords(buffer, words_offsets)
+
+
+class DiskCache:
+    """
+    SQLite cache from text keys (see text_key) to their words, bounded by the approximate size of the database.
+    Pickles to its path and limits, and every process opens its own connection.
+    """
+
+    def __init__(self, path: str | Path | None = None, max_bytes: int = 2 ** 30, timeout: float = 60.0):
+        self.path = Path(path) if path is not None else get_cache_dir() / "words.sqlite"
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection must not be used in a forked process
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                         check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(_SCHEMA)
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def get_many(self, keys: list[bytes]) -> list[CompactWords | None]:
+        """The cached words of every key, or None for keys that are not cached."""
+        found = {}
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(keys), _MAX_PARAMETERS):
+                chunk = keys[start:start + _MAX_PARAMETERS]
+                query = f"SELECT key, buffer, offsets FROM words WHERE key IN ({','.join('?' * len(chunk))})"
+                for key, buffer, offsets in connection.execute(query, chunk):
+                    found[key] = _decode(buffer, offsets)
+            results = [found.get(key) for key in keys]
+            num_misses = results.count(None)
+            self.hits += len(keys) - num_misses
+            self.misses += num_misses
+        return results
+
+    def put_many(self, items: list[tuple[bytes, CompactWords]]):
+        """Cache the words of every key in one transaction, then evict the oldest entries if over max_bytes."""
+        rows = []
+        for key, words in items:
+            offsets = words.offsets.tobytes()
+            rows.append((key, words.buffer, offsets, len(key) + len(words.buffer) + len(offsets)))
+
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany("INSERT OR IGNORE INTO words (key, buffer, offsets, size) VALUES (?, ?, ?, ?)",
+                                       rows)
+                self._evict(connection)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _evict(self, connection: sqlite3.Connection):
+        (page_size,), = connection.execute("PRAGMA page_size")
+        (page_count,), = connection.execute("PRAGMA page_count")
+        (freelist_count,), = connection.execute("PRAGMA freelist_count")
+        used = (page_count - freelist_count) * page_size
+        if used <= self.max_bytes:
+            return
+
+        # Down to 90% of max_bytes, so eviction does not run again on the next write
+        bound = connection.execute(_EVICTION_BOUND_QUERY, (used - self.max_bytes * 9 // 10,)).fetchone()
+        if bound is None:
+            connection.execute("DELETE FROM words")
+        else:
+            connection.execute("DELETE FROM words WHERE rowid <= ?", bound)
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,), = self._connect().execute("SELECT COUNT(*) FROM words")
+        return count
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute("DELETE FROM words")
+            self.hits = self.misses = 0
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def __getstate__(self) -> dict:
+        # Only the settings: connections and locks can not be pickled, and counters are per process
+        return {"path": self.path, "max_bytes": self.max_bytes, "timeout": self.timeout}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({str(self.path)!r}, hits={self.hits}, misses={self.misses})"
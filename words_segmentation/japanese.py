@@ -9,6 +9,8 @@ from functools import cache
 
 import regex
 
+from words_segmentation.pool import InstancePool
+
 
 def has_japanese(text: str) -> bool:
     """
@@ -30,6 +32,18 @@ def has_japanese(text: str) -> bool:
     return bool(regex.search(r'[\p{Hiragana}\p{Katakana}\p{Han}]', text))
 
 
+def create_japanese_tagger():
+    """A new fugashi tagger configured for word segmentation (see get_japanese_tagger)."""
+    try:
+        from fugashi import Tagger
+    except ImportError:
+        print("Error: fugashi library not found. Please install it with: pip install 'fugashi[unidic-lite]'")
+        raise
+
+    # -Owakati: Output format that produces space-separated words only
+    return Tagger('-Owakati')
+
+
 @cache
 def get_japanese_tagger():
     """
@@ -46,14 +60,17 @@ def get_japanese_tagger():
     Raises:
         ImportError: If the fugashi library or unidic-lite dictionary is not installed
     """
-    try:
-        from fugashi import Tagger
-    except ImportError:
-        print("Error: fugashi library not found. Please install it with: pip install 'fugashi[unidic-lite]'")
-        raise
+    return create_japanese_tagger()
 
-    # -Owakati: Output format that produces space-separated words only
-    return Tagger('-Owakati')
+
+@cache
+def get_japanese_tagger_pool() -> InstancePool:
+    """
+    The pool of taggers that segment_japanese uses, so concurrent threads each parse with their own tagger.
+    It starts with get_japanese_tagger()'s, and creates more on demand, up to the CPU count
+    (set get_japanese_tagger_pool().max_instances to change it).
+    """
+    return InstancePool(create_japanese_tagger, instances=(get_japanese_tagger(),))
 
 
 def segment_japanese(text: str) -> list[str]:
@@ -74,6 +91,22 @@ def segment_japanese(text: str) -> list[str]:
         >>> segment_japanese("私は学生です")
         "私 は 学生 です"
     """
-    tagger = get_japanese_tagger()
-    # Parse the text and return space-separated morphemes
-    return [str(word) for word in tagger(text)]
+    with get_japanese_tagger_pool().acquire() as tagger:
+        return _parse_surfaces(tagger, text)
+
+
+def _parse_surfaces(tagger, text: str) -> list[str]:
+    """
+    The surfaces of text's morphemes, split from the tagger's wakati output, without a Node object per morpheme.
+    MeCab never puts a space in a surface, but fugashi strips its output, which would drop whitespace morphemes
+    (e.g. U+3000) at the end, so text that ends with whitespace is parsed into nodes instead.
+    """
+    if not text or text[-1].isspace():
+        return [str(word) for word in tagger(text)]
+    return tagger.parse(text).split(" ")
+
+
+def segment_japanese_batch(texts: list[str]) -> list[list[str]]:
+    """Segment many Japanese texts like segment_japanese, with one tagger from the pool."""
+    with get_japanese_tagger_pool().acquire() as tagger:
+        return [_parse_surfaces(tagger, text) for text in texts]
@@ -5,16 +5,28 @@ Script-aware segmentation with per-language callbacks.
 - Each non-default segment is passed to its language-specific callback.
 """
 
+import unicodedata
 from collections.abc import Callable, Iterable
-from functools import cache
-from itertools import chain
+from functools import cache, partial
+from importlib import metadata
+from itertools import chain, islice
 from typing import Any, TypedDict
 
 import regex
-from utf8_tokenizer.control import CONTROl_TOKENS_PATTERN
 
-from words_segmentation.chinese import segment_chinese
-from words_segmentation.japanese import segment_japanese
+from words_segmentation.cache import SpanCache
+from words_segmentation.chinese import initialize_chinese_segmenter, segment_chinese, segment_chinese_batch
+from words_segmentation.control import CONTROL_TOKENS_PATTERN
+from words_segmentation.dictionary import (
+    find_word_list,
+    get_dictionary_dir,
+    segment_burmese,
+    segment_khmer,
+    segment_lao,
+    segment_thai,
+)
+from words_segmentation.japanese import segment_japanese, segment_japanese_batch
+from words_segmentation.scripts import build_script_table, script_runs
 from words_segmentation.signwriting import segment_signwriting
 
 # Three classes of tokens inside the Default branch:
@@ -22,8 +34,8 @@ from words_segmentation.signwriting import segment_signwriting
 # 2) "Words" = runs of non-space, non-control + optional trailing single space
 # 3) Whitespace runs
 _TOKEN_PATTERN = (
-    rf"[{CONTROl_TOKENS_PATTERN}]"  # 1) Control tokens
-    rf"|[^\s{CONTROl_TOKENS_PATTERN}]+\s?"  # 2) Word (+ optional trailing space)
+    rf"[{CONTROL_TOKENS_PATTERN}]"  # 1) Control tokens
+    rf"|[^\s{CONTROL_TOKENS_PATTERN}]+\s?"  # 2) Word (+ optional trailing space)
     r"|\s+"  # 3) Whitespace runs
 )
 _COMPILED_TOKEN_PATTERN = regex.compile(_TOKEN_PATTERN)
@@ -34,11 +46,37 @@ def text_to_unbound_words(text: str) -> list[str]:
     return _COMPILED_TOKEN_PATTERN.findall(text)
 
 
-class LanguageSpec(TypedDict):
+class _RequiredLanguageSpec(TypedDict):
     scripts: tuple[str, ...]  # e.g., ("Han",) or ("Han", "Hiragana", "Katakana")
     callback: Callable[[str], Any]  # called with the matched span
 
 
+class LanguageSpec(_RequiredLanguageSpec, total=False):
+    batch_callback: Callable[[list[str]], list[Any]]  # called with many spans, same results as callback for each
+    single_character_words: bool  # a one-character span is a single word, without calling a callback
+
+
+# Languages segmented with a word list (see dictionary.py): their scripts, word list and callback
+_DICTIONARY_LANGUAGES = {
+    "Thai": (("Thai",), "thai", segment_thai),
+    "Lao": (("Lao",), "lao", segment_lao),
+    "Khmer": (("Khmer",), "khmer", segment_khmer),
+    "Burmese": (("Myanmar",), "burmese", segment_burmese),
+}
+
+
+def dictionary_language_specs() -> dict[str, LanguageSpec]:
+    """
+    The specs of the languages segmented with a word list that have one (see dictionary.find_word_list).
+    Languages without a word list get no branch, so their text stays in Default and is split at spaces.
+    """
+    return {
+        name: {"scripts": scripts, "callback": callback, "single_character_words": True}
+        for name, (scripts, language, callback) in _DICTIONARY_LANGUAGES.items()
+        if find_word_list(language) is not None
+    }
+
+
 LANGUAGE_SPECS: dict[str, LanguageSpec] = {
     "SignWriting": {
         "scripts": ("SignWriting",),
@@ -47,11 +85,16 @@ LANGUAGE_SPECS: dict[str, LanguageSpec] = {
     "Chinese": {
         "scripts": ("Han",),
         "callback": segment_chinese,
+        "batch_callback": segment_chinese_batch,
+        "single_character_words": True,
     },
     "Japanese": {
         "scripts": ("Han", "Hiragana", "Katakana"),
         "callback": segment_japanese,
+        "batch_callback": segment_japanese_batch,
+        "single_character_words": True,
     },
+    **dictionary_language_specs(),
     "Default": {
         "scripts": tuple(),
         "callback": text_to_unbound_words,
@@ -65,41 +108,451 @@ def _union_scx(scripts: tuple[str, ...]) -> str:
     return "(?:" + "|".join(parts) + ")"
 
 
-@cache
-def build_regex_from_languages() -> regex.Pattern:
-    """
-    Compile the master regex with named groups for each language plus Default.
+Branches = tuple[tuple[str, tuple[str, ...]], ...]
 
-    Precedence: dict order in LANGUAGE_SPECS — first match wins if script sets overlap.
-    Default branch: consumes runs that do NOT begin with any of the listed scripts.
+
+# Where the master regex's Default branch would take an explicit-script character at position 1 into its last
+# grapheme cluster (after a Prepend character, a mark that extends the cluster, or a virama that joins the next
+# consonant into a conjunct), so the fused regex differs.
+# Conjuncts are only checked from the character before the consonant, so this also matches some marks
+# that join nothing, and falls back needlessly (but rarely).
+_JOINS_PREVIOUS_PATTERN = regex.compile(
+    r"(?s)\p{GCB=Prepend}."
+    r"|[^\p{GCB=Control}\p{GCB=CR}\p{GCB=LF}][\p{GCB=Extend}\p{GCB=SpacingMark}\p{GCB=ZWJ}]"
+    r"|[\p{InCB=Linker}\p{InCB=Extend}]\p{InCB=Consonant}"
+)
+
+
+def _branches(language_specs: dict[str, LanguageSpec]) -> Branches:
+    """
+    The (name, scripts) of the non-Default branches of language specs, in precedence order.
+    Compiled patterns are cached by them, so specs with the same branches share their patterns.
     """
-    # Explicit language branches (skip Default — it has no 'scripts')
-    branches: list[str] = []
-    for name, spec in LANGUAGE_SPECS.items():
-        if spec["scripts"]:
-            branches.append(fr"(?P<{name}>{_union_scx(spec['scripts'])}+)")
+    return tuple((name, tuple(spec["scripts"])) for name, spec in language_specs.items() if spec["scripts"])
+
+
+def _branches_scripts(branches: Branches) -> tuple[str, ...]:
+    """All scripts that have their own (non-Default) branch."""
+    return tuple(sorted({s for _, scripts in branches for s in scripts}))
+
+
+@cache
+def _compile_master_regex(branches: Branches) -> regex.Pattern:
+    # Explicit language branches (Default has no 'scripts')
+    patterns = [fr"(?P<{name}>{_union_scx(scripts)}+)" for name, scripts in branches]
 
     # Default: refuse any char that begins one of the explicit-script branches
-    all_scripts = tuple(sorted({s for spec in LANGUAGE_SPECS.values() for s in spec.get("scripts", ())}))
+    all_scripts = _branches_scripts(branches)
     forbidden = _union_scx(all_scripts) if all_scripts else r"$a"  # impossible atom if no scripts exist
     default_branch = fr"(?P<Default>(?:(?!{forbidden})\X)+)"
 
     # Combined pattern (verbose mode for readability)
-    pattern = r"(?x)(?:" + "|".join(branches + [default_branch]) + r")"
+    pattern = r"(?x)(?:" + "|".join(patterns + [default_branch]) + r")"
     return regex.compile(pattern)
 
 
-def segment_text(text: str) -> Iterable[Any]:
+@cache
+def _compile_scripts_regex(branches: Branches) -> regex.Pattern:
+    all_scripts = _branches_scripts(branches)
+    if not all_scripts:
+        return regex.compile(r"$a")  # impossible atom if no scripts exist
+    return regex.compile("[" + "".join(fr"\p{{scx={s}}}" for s in all_scripts) + "]")
+
+
+@cache
+def _ascii_is_default(branches: Branches) -> bool:
+    """Whether no branch matches an ASCII character, so ASCII text is always a single Default span."""
+    return _compile_scripts_regex(branches).search("".join(map(chr, range(128)))) is None
+
+
+def build_regex_from_languages(language_specs: dict[str, LanguageSpec] | None = None) -> regex.Pattern:
+    """
+    The master regex with named groups for each language plus Default, for language_specs (default LANGUAGE_SPECS).
+    Compiled once per set of branches, so changes to LANGUAGE_SPECS take effect on the next call.
+
+    Precedence: dict order in the specs — first match wins if script sets overlap.
+    Default branch: consumes runs that do NOT begin with any of the listed scripts.
+    """
+    return _compile_master_regex(_branches(LANGUAGE_SPECS if language_specs is None else language_specs))
+
+
+def build_scripts_regex(language_specs: dict[str, LanguageSpec] | None = None) -> regex.Pattern:
+    """A single character class matching any character of the explicit-script branches."""
+    return _compile_scripts_regex(_branches(LANGUAGE_SPECS if language_specs is None else language_specs))
+
+
+def _explicit_branches(language_specs: dict[str, LanguageSpec] | None = None) \
+        -> tuple[tuple[str, ...], tuple[tuple[str, ...], ...]]:
+    """Names and scripts of the non-Default branches of the specs (default LANGUAGE_SPECS), in precedence order."""
+    branches = _branches(LANGUAGE_SPECS if language_specs is None else language_specs)
+    return tuple(name for name, _ in branches), tuple(scripts for _, scripts in branches)
+
+
+@cache
+def _compile_fused_regex(branches: Branches) -> regex.Pattern:
+    """
+    The master regex with its Default branch replaced by the Default tokens (see _TOKEN_PATTERN),
+    to find the explicit-script spans and the Default tokens in a single pass.
+    Default tokens never contain a character of the explicit scripts.
+    """
+    patterns = [fr"(?P<{name}>{_union_scx(scripts)}+)" for name, scripts in branches]
+    scripts = "".join(fr"\p{{scx={s}}}" for s in _branches_scripts(branches))
+    whitespace = fr"[^\S{scripts}]"
+    default_branch = (
+        fr"(?P<Default>[{CONTROL_TOKENS_PATTERN}]"
+        fr"|[^\s{CONTROL_TOKENS_PATTERN}{scripts}]+{whitespace}?"
+        fr"|{whitespace}+)"
+    )
+    return regex.compile("|".join(patterns + [default_branch]))
+
+
+# Below this length, the master regex is faster than converting the text for the script lookup table
+_SCRIPT_TABLE_MIN_LENGTH = 256
+
+# Text with a span for every branch of LANGUAGE_SPECS that loads a model
+# (dictionary tries are memory-mapped, so loading them up front saves nothing)
+_WARMUP_TEXT = "Hello 我爱北京天安门 すもももももももものうち 𝠀񀀒񀀚񋚥񋛩𝠃𝤟𝤩񋛩𝣵𝤐񀀒𝤇𝣤񋚥𝤐𝤆񀀚𝣮𝣭"
+
+# A token boundary inside a Default span that is safe to restart segmentation from:
+# after whitespace, before a non-space character that does not extend the previous grapheme cluster.
+_STREAM_CUT_PATTERN = regex.compile(r"(?r)(?<=\s)(?=[^\s\p{GCB=Extend}\p{GCB=SpacingMark}\p{GCB=ZWJ}])")
+
+
+def _words_with_offsets(words: Iterable[str], span: str, offset: int) -> list[tuple[str, int, int]]:
+    """
+    Attach (start, end) character offsets to the words a callback returned for a span starting at offset.
+    Callbacks return substrings of their span in order, but may skip characters (e.g. unparsable SignWriting).
+    """
+    spans = []
+    cursor = 0
+    for word in words:
+        start = cursor if span.startswith(word, cursor) else span.find(word, cursor)
+        if start < 0:
+            raise ValueError(f"Segmented word {word!r} is not a substring of {span!r}")
+        cursor = start + len(word)
+        spans.append((word, offset + start, offset + cursor))
+    return spans
+
+
+# Packages whose version may change the words of a text
+_FINGERPRINT_PACKAGES = ("words-segmentation", "regex", "jieba", "fugashi", "unidic-lite", "pythainlp", "signwriting")
+
+
+@cache
+def _environment_fingerprint() -> tuple:
+    """The versions of the segmentation packages and of Unicode, and the word lists in the dictionary dir."""
+    versions = []
+    for package in _FINGERPRINT_PACKAGES:
+        try:
+            versions.append((package, metadata.version(package)))
+        except metadata.PackageNotFoundError:
+            versions.append((package, None))
+    dictionary_dir = get_dictionary_dir()
+    word_lists = sorted((path.name, path.stat().st_size, path.stat().st_mtime_ns)
+                        for path in dictionary_dir.glob("*.txt")) if dictionary_dir.is_dir() else []
+    return tuple(versions), unicodedata.unidata_version, tuple(word_lists)
+
+
+def _qualified_name(function: Callable) -> str:
+    return f"{getattr(function, '__module__', None)}.{getattr(function, '__qualname__', repr(function))}"
+
+
+def _fill_spans(words: list[str | None], results: Iterable[Iterable[str]]) -> list[str]:
+    """Replace every None in words with the words of the next span."""
+    filled = []
+    start = 0
+    for result in results:
+        index = words.index(None, start)
+        filled += words[start:index]
+        filled += result
+        start = index + 1
+    if not start:
+        return words
+    filled += words[start:]
+    return filled
+
+
+class Segmenter:
+    """
+    Script-aware segmentation with its own language specs, or LANGUAGE_SPECS (including later changes to it).
+    Compiled patterns are cached per set of branches (names and scripts) and shared between segmenters,
+    so segmenters with different specs can be used side by side, e.g. per tenant, without recompiling.
+    Every spec must map a language name to its scripts and callback, and include a Default spec.
+    A SpanCache should only be shared between segmenters with the same callbacks.
+    """
+
+    def __init__(self, language_specs: dict[str, LanguageSpec] | None = None):
+        if language_specs is not None and "Default" not in language_specs:
+            raise ValueError("language_specs must include a Default spec")
+        self._language_specs = language_specs
+
+    @property
+    def language_specs(self) -> dict[str, LanguageSpec]:
+        return LANGUAGE_SPECS if self._language_specs is None else self._language_specs
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self.language_specs)})"
+
+    def fingerprint(self) -> str:
+        """
+        What the words of a text depend on, for persistent caches (see disk_cache.DiskCache): the language specs
+        (callbacks by their qualified name), the versions of the segmentation packages and of Unicode,
+        and the word lists in the dictionary dir (as when first called in this process).
+        """
+        specs = tuple((name, tuple(spec["scripts"]), _qualified_name(spec["callback"]),
+                       spec.get("batch_callback") and _qualified_name(spec["batch_callback"]),
+                       spec.get("single_character_words", False)) for name, spec in self.language_specs.items())
+        return repr((specs, _environment_fingerprint()))
+
+    def iter_spans(self, text: str) -> Iterable[tuple[str, int, int]]:
+        """
+        The (group name, start, end) of every span of text matched by the master regex.
+        Longer texts are split with the script lookup table (see scripts.script_runs), with the same result.
+        """
+        branches = _branches(self.language_specs)
+        if len(text) >= _SCRIPT_TABLE_MIN_LENGTH:
+            runs = script_runs(text, tuple(name for name, _ in branches), tuple(scripts for _, scripts in branches))
+            if runs is not None:
+                return runs
+        return ((m.lastgroup, m.start(), m.end()) for m in _compile_master_regex(branches).finditer(text))
+
+    def is_default_only(self, text: str) -> bool:
+        """
+        Check if text has no characters of the explicit-script branches, so it is one Default span.
+        ASCII text is accepted without a scan (unless a branch has ASCII characters); otherwise a single
+        character class search is much cheaper than the master regex, whose Default branch runs a lookahead
+        before every grapheme.
+        """
+        branches = _branches(self.language_specs)
+        if text.isascii() and _ascii_is_default(branches):
+            return True
+        return _compile_scripts_regex(branches).search(text) is None
+
+    def warmup(self):
+        """
+        Compile the patterns, and load the language segmenters of the text's scripts (see languages.warmup).
+        Call it in a parent process before forking workers, so they share the loaded dictionaries copy-on-write.
+        """
+        build_script_table(_explicit_branches(self.language_specs)[1])
+        for _ in self.segment_text(_WARMUP_TEXT):
+            pass
+
+    def segment_span(self, group_name: str, span: str, cache: SpanCache | None = None) -> Any:
+        """Call the language callback for a span, through the cache if given (Default spans are never cached)."""
+        spec = self.language_specs[group_name]
+        if len(span) == 1 and spec.get("single_character_words", False):
+            return [span]
+        if cache is None or group_name == "Default":
+            return spec["callback"](span)
+        return cache.lookup(group_name, span, spec["callback"])
+
+    def segment_spans(self, group_name: str, spans: list[str], cache: SpanCache | None = None) -> list[Any]:
+        """
+        Like segment_span for many spans of one language, e.g. all of its spans in a batch of texts.
+        - One-character spans are single words without a callback, if the spec has single_character_words.
+        - The other spans are passed to the spec's batch_callback in a single call, if it has one.
+        - With a cache, only the distinct spans that are not cached are segmented.
+        """
+        spec = self.language_specs[group_name]
+        single_character_words = spec.get("single_character_words", False)
+        pending = [span for span in spans if len(span) > 1] if single_character_words else spans
+        if not pending:
+            return [[span] for span in spans]
+
+        batch_callback = spec.get("batch_callback") or partial(map, spec["callback"])
+        if cache is None or group_name == "Default":
+            segmented = batch_callback(pending)
+        else:
+            segmented = cache.lookup_many(group_name, pending, batch_callback)
+        if len(pending) == len(spans):
+            return list(segmented)
+        segmented = iter(segmented)
+        return [next(segmented) if len(span) > 1 else [span] for span in spans]
+
+    def segment_text(self, text: str, cache: SpanCache | None = None) -> Iterable[Any]:
+        """
+        Iterate over callback results for each matched span.
+        - Non-Default groups call their language callback.
+        - Default group calls its callback if present in the language specs.
+        - With a cache, repeated non-Default spans reuse earlier callback results.
+        """
+        if text and self.is_default_only(text):
+            yield self.language_specs["Default"]["callback"](text)
+            return
+
+        for group_name, start, end in self.iter_spans(text):
+            yield self.segment_span(group_name, text[start:end], cache)
+
+    def _segment_spans_coalesced(self, spans: list[tuple[str, str]], cache: SpanCache | None) -> list[Any]:
+        """The callback results of (group name, span) pairs, with one segment_spans call per language."""
+        language_spans = {}
+        for group_name, span in spans:
+            language_spans.setdefault(group_name, []).append(span)
+        if len(language_spans) == len(spans):  # Nothing to coalesce
+            return [self.segment_span(group_name, span, cache) for group_name, span in spans]
+
+        segmented = {group_name: iter(self.segment_spans(group_name, language_spans[group_name], cache))
+                     for group_name in language_spans}
+        return [next(segmented[group_name]) for group_name, _ in spans]
+
+    def _fused_split(self, text: str) -> tuple[list[str | None], list[tuple[str, str]]] | None:
+        """_split_words from a single pass of the fused regex, or None where it differs from the master regex."""
+        words = []
+        spans = []
+        default_end = -1
+        for match in _compile_fused_regex(_branches(self.language_specs)).finditer(text):
+            group_name = match.lastgroup
+            if group_name == "Default":
+                words.append(match.group())
+                default_end = match.end()
+                continue
+            start = match.start()
+            if start == default_end and _JOINS_PREVIOUS_PATTERN.match(text, start - 1):
+                return None  # Rare, e.g. a Thai vowel sign after a Latin letter
+            words.append(None)
+            spans.append((group_name, match.group()))
+        return words, spans
+
+    def _split_words(self, text: str) -> tuple[list[str | None], list[tuple[str, str]]]:
+        """
+        The Default tokens of text, with None in place of every span to segment with a callback,
+        and those (group name, span) in order.
+        With the default Default callback (text_to_unbound_words), short texts take a single pass of the fused
+        regex, which finds explicit-script spans and Default tokens together, without the master regex's lookahead
+        before every grapheme. Longer texts are faster with the script lookup table, and Default tokens are found
+        in place, without strings of the Default spans.
+        """
+        tokenize = self.language_specs["Default"]["callback"] is text_to_unbound_words
+        if tokenize and self.is_default_only(text):
+            return _COMPILED_TOKEN_PATTERN.findall(text), []
+        if tokenize and len(text) < _SCRIPT_TABLE_MIN_LENGTH:
+            split = self._fused_split(text)
+            if split is not None:
+                return split
+
+        words = []
+        spans = []
+        for group_name, start, end in self.iter_spans(text):
+            if tokenize and group_name == "Default":
+                words += _COMPILED_TOKEN_PATTERN.findall(text, start, end)
+            else:
+                words.append(None)
+                spans.append((group_name, text[start:end]))
+        return words, spans
+
+    def segment_words_batch(self, texts: list[str], cache: SpanCache | None = None) -> list[list[str]]:
+        """
+        The words of every text, as chained from segment_text, with the spans of each language coalesced:
+        each language is segmented once for all of its spans in all texts (see segment_spans).
+        """
+        splits = [self._split_words(text) for text in texts]
+        spans = [span for _, text_spans in splits for span in text_spans]
+        results = iter(self._segment_spans_coalesced(spans, cache))
+        return [_fill_spans(words, islice(results, len(text_spans))) if text_spans else words
+                for words, text_spans in splits]
+
+    def segment_words(self, text: str, cache: SpanCache | None = None) -> list[str]:
+        """The words of all spans, as chained from segment_text, without intermediate lists (see _split_words)."""
+        return self.segment_words_batch([text], cache)[0]
+
+    def segment_text_with_offsets(self, text: str, cache: SpanCache | None = None) \
+            -> Iterable[list[tuple[str, int, int]]]:
+        """
+        Like segment_text, but each callback result is a list of (word, start, end) with character offsets in text.
+        Offsets come from the span positions of the master regex, and the words' positions within each span.
+        """
+        if text and self.is_default_only(text):
+            yield _words_with_offsets(self.language_specs["Default"]["callback"](text), text, 0)
+            return
+
+        for group_name, start, end in self.iter_spans(text):
+            span = text[start:end]
+            yield _words_with_offsets(self.segment_span(group_name, span, cache), span, start)
+
+    def segment_stream(self, chunks: Iterable[str], cache: SpanCache | None = None) -> Iterable[Any]:
+        """
+        Like segment_text, but over an iterable of text chunks, yielding the same results as for the joined text.
+        - Every span except the last one in the buffer is final, and is passed to its callback.
+        - The last span is carried over to the next chunk, as it may continue there.
+          Default spans are only carried over from their last token boundary.
+        Memory is bounded by the chunk size plus the longest span (or Default word) in the text.
+        """
+        carry = ""
+        for chunk in chunks:
+            if not chunk:
+                continue
+
+            buffer = carry + chunk
+            last = None
+            for span in self.iter_spans(buffer):
+                if last is not None:
+                    yield self.segment_span(last[0], buffer[last[1]:last[2]], cache)
+                last = span
+
+            group_name, start, _ = last
+            if group_name == "Default":
+                cut = _STREAM_CUT_PATTERN.search(buffer, start + 1)
+                if cut is not None:
+                    yield self.language_specs["Default"]["callback"](buffer[start:cut.start()])
+                    start = cut.start()
+            carry = buffer[start:]
+
+        if carry:
+            yield from self.segment_text(carry, cache)
+
+
+# Segments with LANGUAGE_SPECS, for the module-level functions below
+DEFAULT_SEGMENTER = Segmenter()
+
+
+def iter_spans(text: str) -> Iterable[tuple[str, int, int]]:
+    """Segmenter.iter_spans with LANGUAGE_SPECS."""
+    return DEFAULT_SEGMENTER.iter_spans(text)
+
+
+def is_default_only(text: str) -> bool:
+    """Segmenter.is_default_only with LANGUAGE_SPECS."""
+    return DEFAULT_SEGMENTER.is_default_only(text)
+
+
+def warmup():
     """
-    Iterate over callback results for each matched span.
-    - Non-Default groups call their language callback.
-    - Default group calls its callback if present in LANGUAGE_SPECS.
+    Compile the regexes and load every language segmenter (jieba's dictionary, the MeCab tagger),
+    so the first text is segmented as fast as the next ones.
+    Call it in a parent process before forking workers, so they share the loaded dictionaries copy-on-write.
     """
-    pat = build_regex_from_languages()
-    for m in pat.finditer(text):
-        group_name = m.lastgroup
-        spec = LANGUAGE_SPECS.get(group_name)
-        yield spec["callback"](m.group(0))
+    initialize_chinese_segmenter()
+    DEFAULT_SEGMENTER.warmup()
+
+
+def segment_span(group_name: str, span: str, cache: SpanCache | None = None) -> Any:
+    """Segmenter.segment_span with LANGUAGE_SPECS."""
+    return DEFAULT_SEGMENTER.segment_span(group_name, span, cache)
+
+
+def segment_text(text: str, cache: SpanCache | None = None) -> Iterable[Any]:
+    """Segmenter.segment_text with LANGUAGE_SPECS."""
+    return DEFAULT_SEGMENTER.segment_text(text, cache)
+
+
+def segment_words(text: str, cache: SpanCache | None = None) -> list[str]:
+    """Segmenter.segment_words with LANGUAGE_SPECS."""
+    return DEFAULT_SEGMENTER.segment_words(text, cache)
+
+
+def segment_words_batch(texts: list[str], cache: SpanCache | None = None) -> list[list[str]]:
+    """Segmenter.segment_words_batch with LANGUAGE_SPECS."""
+    return DEFAULT_SEGMENTER.segment_words_batch(texts, cache)
+
+
+def segment_text_with_offsets(text: str, cache: SpanCache | None = None) -> Iterable[list[tuple[str, int, int]]]:
+    """Segmenter.segment_text_with_offsets with LANGUAGE_SPECS."""
+    return DEFAULT_SEGMENTER.segment_text_with_offsets(text, cache)
+
+
+def segment_stream(chunks: Iterable[str], cache: SpanCache | None = None) -> Iterable[Any]:
+    """Segmenter.segment_stream with LANGUAGE_SPECS."""
+    return DEFAULT_SEGMENTER.segment_stream(chunks, cache)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+"""
+Bounded pools of segmenter instances, for language callbacks called from many threads.
+
+A MeCab tagger keeps its lattice between calls, so one instance must not parse from two threads at once.
+fugashi holds the GIL while parsing, so a single process-wide tagger is safe but serializes every thread;
+without the GIL (free-threaded Python), concurrent calls on one tagger are unsafe.
+A pool gives every concurrent caller its own instance, created on demand up to a bound (by default the CPU count),
+and callers wait for a free instance beyond it. Instances are reused last-in first-out,
+so a single thread always gets the same one, and idle instances are kept for the next callers.
+"""
+
+import os
+import threading
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class InstancePool(Generic[T]):
+    """At most max_instances instances from factory, each used by one caller at a time."""
+
+    def __init__(self, factory: Callable[[], T], max_instances: int | None = None, instances: tuple[T, ...] = ()):
+        self.factory = factory
+        self.max_instances = max_instances or os.cpu_count() or 1
+        self._idle = list(instances)
+        self._created = len(self._idle)
+        self._waiting = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    def __len__(self) -> int:
+        """Number of instances created so far."""
+        return self._created
+
+    def _take(self) -> T:
+        with self._lock:
+            while not self._idle and self._created >= self.max_instances:
+                self._waiting += 1
+                self._available.wait()
+                self._waiting -= 1
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+
+        # Created outside the lock, since it may be slow (e.g. loading a dictionary)
+        try:
+            return self.factory()
+        except BaseException:
+            with self._lock:
+                self._created -= 1
+                if self._waiting:
+                    self._available.notify()
+            raise
+
+    def _give(self, instance: T):
+        with self._lock:
+            self._idle.append(instance)
+            if self._waiting:
+                self._available.notify()
+
+    def acquire(self) -> "_Lease[T]":
+        """
+        A context manager that holds an instance for the duration of the with block,
+        waiting for one if all max_instances are in use.
+        """
+        return _Lease(self)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(created={self._created}, idle={len(self._idle)}, max={self.max_instances})"
+
+
+class _Lease(Generic[T]):
+    # A class rather than contextlib.contextmanager, whose generator costs more than a short MeCab parse
+    __slots__ = ("pool", "instance")
+
+    def __init__(self, pool: InstancePool[T]):
+        self.pool = pool
+
+    def __enter__(self) -> T:
+        self.instance = self.pool._take()
+        return self.instance
+
+    def __exit__(self, *exc_info):
+        self.pool._give(self.instance)
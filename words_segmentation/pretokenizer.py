@@ -1,35 +1,304 @@
+import codecs
 import math
+import os
 import re
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
 from itertools import chain
+from typing import IO
 
 import regex
-import torch
-from transformers import PreTrainedTokenizer, StoppingCriteria, add_start_docstrings
-from transformers.generation.stopping_criteria import STOPPING_CRITERIA_INPUTS_DOCSTRING
-from utf8_tokenizer.control import CONTROl_TOKENS_PATTERN
 
-from words_segmentation.languages import segment_text
+from words_segmentation.cache import SpanCache
+from words_segmentation.compact import CompactWords
+from words_segmentation.control import CONTROL_TOKENS_PATTERN
+from words_segmentation.disk_cache import DiskCache, text_key
+from words_segmentation.languages import DEFAULT_SEGMENTER, Segmenter, warmup
 
 _COMPILED_GRAPHEME_PATTERN = regex.compile(r"\X")
-_COMPLETE_WORD_PATTERNS = [
-    rf"[{CONTROl_TOKENS_PATTERN}]",  # Control tokens are always complete
-    rf"[^\s{CONTROl_TOKENS_PATTERN}]+\s",  # Words with trailing space are complete
-]
+# Characters that may join a neighbour into one grapheme cluster (anything but GCB Other/Control/LF).
+# Without them, every code point is its own cluster, and text can be split at any UTF-8 character boundary.
+_COMPILED_CLUSTERING_PATTERN = regex.compile(r"[^\p{GCB=Other}\p{GCB=Control}\p{GCB=LF}]")
+_COMPILED_COMPLETE_WORD_PATTERN = re.compile(
+    rf"[{CONTROL_TOKENS_PATTERN}]"  # Control tokens are always complete
+    rf"|[^\s{CONTROL_TOKENS_PATTERN}]+\s"  # Words with trailing space are complete
+)
 
 
 def words_to_text(words: Iterable[str]) -> str:
+    if isinstance(words, CompactWords):
+        return words.to_text()
     return ''.join(words)
 
 
-def text_to_words(text: str, max_bytes: int = math.inf) -> list[str]:
-    words = chain.from_iterable(segment_text(text))
-
+def _limit_words_bytes(words: Iterable[str], max_bytes: int) -> Iterable[str]:
     if max_bytes == math.inf:
-        return list(words)
+        return words
+    return utf8_chunks_grapheme_safe_batch(words, max_bytes=max_bytes)
+
+
+def _finish_words(words: list[str], max_bytes: int, compact: bool) -> list[str] | CompactWords:
+    # Most texts have no word that may be over the limit, which takes no pass over their bytes
+    if max_bytes != math.inf and max(map(len, words), default=0) * 4 > max_bytes:
+        words = list(utf8_chunks_grapheme_safe_batch(words, max_bytes=max_bytes))
+    return CompactWords.from_words(words) if compact else words
+
+
+def text_to_words(text: str,
+                  max_bytes: int = math.inf,
+                  cache: SpanCache | None = None,
+                  compact: bool = False,
+                  segmenter: Segmenter | None = None,
+                  disk_cache: DiskCache | None = None) -> list[str] | CompactWords:
+    """
+    Segment text into words, with the segmenter's language specs (default LANGUAGE_SPECS).
+    With compact=True, the words are returned as CompactWords.
+    With a disk_cache, words segmented before (with the same segmenter and max_bytes) are read from it.
+    """
+    if disk_cache is not None:
+        return _texts_to_words([text], max_bytes, cache, compact, segmenter, disk_cache)[0]
+    return _finish_words((segmenter or DEFAULT_SEGMENTER).segment_words(text, cache), max_bytes, compact)
+
+
+def _texts_to_words(texts: list[str],
+                    max_bytes: int = math.inf,
+                    cache: SpanCache | None = None,
+                    compact: bool = False,
+                    segmenter: Segmenter | None = None,
+                    disk_cache: DiskCache | None = None) -> list[list[str] | CompactWords]:
+    """text_to_words for many texts, with each language's spans segmented together (see segment_words_batch)."""
+    segmenter = segmenter or DEFAULT_SEGMENTER
+    if disk_cache is not None:
+        return _cached_texts_to_words(texts, max_bytes, cache, compact, segmenter, disk_cache)
+    words_batch = segmenter.segment_words_batch(texts, cache)
+    return [_finish_words(words, max_bytes, compact) for words in words_batch]
+
+
+def _cached_texts_to_words(texts: list[str],
+                           max_bytes: int,
+                           cache: SpanCache | None,
+                           compact: bool,
+                           segmenter: Segmenter,
+                           disk_cache: DiskCache) -> list[list[str] | CompactWords]:
+    """_texts_to_words, reading the words of texts from disk_cache, and segmenting (then caching) the rest."""
+    config = f"{segmenter.fingerprint()}:{max_bytes}".encode()
+    keys = [text_key(text, config) for text in texts]
+    results = disk_cache.get_many(keys)
+
+    if not compact:
+        results = [words if words is None else list(words) for words in results]
+
+    missing = [i for i, words in enumerate(results) if words is None]
+    if missing:
+        words_batch = segmenter.segment_words_batch([texts[i] for i in missing], cache)
+        new_words = {}  # By key, since texts may repeat
+        for i, words in zip(missing, words_batch, strict=True):
+            results[i] = words = _finish_words(words, max_bytes, compact)
+            new_words[keys[i]] = words if compact else CompactWords.from_words(words)
+        disk_cache.put_many(list(new_words.items()))
+    return results
+
+
+def text_to_words_with_offsets(text: str,
+                               max_bytes: int = math.inf,
+                               return_byte_offsets: bool = False,
+                               cache: SpanCache | None = None,
+                               segmenter: Segmenter | None = None) \
+        -> tuple[list[str], list[tuple[int, int]], list[tuple[int, int]] | None]:
+    """
+    Like text_to_words, also returning the (start, end) character offsets of every word in text,
+    and optionally their (start, end) UTF-8 byte offsets (otherwise None).
+    """
+    segmenter = segmenter or DEFAULT_SEGMENTER
+    words = []
+    offsets = []
+    for word, start, _ in chain.from_iterable(segmenter.segment_text_with_offsets(text, cache)):
+        for chunk in _limit_words_bytes((word,), max_bytes):
+            words.append(chunk)
+            offsets.append((start, start + len(chunk)))
+            start += len(chunk)
+
+    if not return_byte_offsets:
+        return words, offsets, None
+
+    byte_offsets = []
+    char_cursor = byte_cursor = 0
+    for word, (start, end) in zip(words, offsets, strict=True):
+        # Words are usually contiguous, but callbacks may skip characters between them
+        if start != char_cursor:
+            byte_cursor += len(text[char_cursor:start].encode("utf-8"))
+        byte_end = byte_cursor + len(word.encode("utf-8"))
+        byte_offsets.append((byte_cursor, byte_end))
+        char_cursor, byte_cursor = end, byte_end
+    return words, offsets, byte_offsets
+
+
+def segment_batch(batch: dict[str, list],
+                  column: str = "text",
+                  max_bytes: int = math.inf,
+                  return_byte_offsets: bool = False,
+                  cache: SpanCache | None = None,
+                  segmenter: Segmenter | None = None) -> dict[str, list]:
+    """
+    Segment the texts of a batch, for datasets.Dataset.map(segment_batch, batched=True, num_proc=...).
+    Returns {"words": [...]}, and with return_byte_offsets, the (start, end) UTF-8 offsets of every word
+    in {"byte_offsets": [...]}. None texts stay None.
+    """
+    texts = batch[column]
+    if not return_byte_offsets:
+        words = iter(_texts_to_words([text for text in texts if text is not None], max_bytes, cache,
+                                     segmenter=segmenter))
+        return {"words": [None if text is None else next(words) for text in texts]}
+
+    words, byte_offsets = [], []
+    for text in texts:
+        if text is None:
+            words.append(None)
+            byte_offsets.append(None)
+        else:
+            text_words, _, text_byte_offsets = text_to_words_with_offsets(text, max_bytes, True, cache, segmenter)
+            words.append(text_words)
+            byte_offsets.append(text_byte_offsets)
+    return {"words": words, "byte_offsets": byte_offsets}
+
+
+def _iter_text_chunks(stream: IO | Iterable[str | bytes], chunk_size: int) -> Iterator[str]:
+    """Read text chunks from a text file, a binary UTF-8 file, or an iterable of str/bytes chunks."""
+    if hasattr(stream, "read"):
+        stream = iter(partial(stream.read, chunk_size), stream.read(0))
+
+    # Bytes chunks may end in the middle of a multi-byte character
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in stream:
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+    yield decoder.decode(b"", final=True)
+
+
+def iter_words(stream: IO | Iterable[str | bytes],
+               max_bytes: int = math.inf,
+               chunk_size: int = 2 ** 16,
+               cache: SpanCache | None = None,
+               segmenter: Segmenter | None = None) -> Iterator[str]:
+    """
+    Stream words from a file-like object or an iterable of text chunks, with bounded memory.
+    Yields the same words as text_to_words on the full text.
+    """
+    segmenter = segmenter or DEFAULT_SEGMENTER
+    words = chain.from_iterable(segmenter.segment_stream(_iter_text_chunks(stream, chunk_size), cache))
+    yield from _limit_words_bytes(words, max_bytes)
+
+
+# A worker's disk cache, set once by its initializer rather than pickled (and connected to) with every chunk
+_worker_disk_cache: DiskCache | None = None
+
+
+def _init_worker(initializer: Callable[[], None], disk_cache: DiskCache | None):
+    global _worker_disk_cache
+    _worker_disk_cache = disk_cache
+    initializer()
+
+
+def _worker_texts_to_words(texts: list[str], **kwargs) -> tuple[list[list[str] | CompactWords], int, int]:
+    """_texts_to_words with the worker's disk cache, also returning its hits and misses on these texts."""
+    disk_cache = _worker_disk_cache
+    if disk_cache is None:
+        return _texts_to_words(texts, **kwargs), 0, 0
+    hits, misses = disk_cache.hits, disk_cache.misses
+    results = _texts_to_words(texts, disk_cache=disk_cache, **kwargs)
+    return results, disk_cache.hits - hits, disk_cache.misses - misses
+
+
+def text_to_words_batch(texts: Iterable[str],
+                        max_bytes: int = math.inf,
+                        num_workers: int | None = None,
+                        chunksize: int = 64,
+                        preload: bool = False,
+                        compact: bool = False,
+                        segmenter: Segmenter | None = None,
+                        disk_cache: DiskCache | None = None) -> list[list[str] | CompactWords]:
+    """
+    Segment many texts using a pool of worker processes.
+    Results are returned in input order. With num_workers=1, texts are segmented in the current process.
+    With compact=True, every text's words are CompactWords, which are also faster to send between processes.
+    Texts are segmented chunksize at a time, with the spans of each language in a chunk segmented together.
+    With a disk_cache, every chunk's words segmented before are read from it, so workers share cached words.
+    Every worker opens its own connection to it, and their hits and misses are added to disk_cache's counters.
+    Every worker loads the language segmenters (see warmup) before its first text.
+    With preload=True, they are loaded in this process first, and workers are forked so they share them instead
+    (where the fork start method is unavailable, as on Windows, every worker still loads its own).
+    """
+    texts = list(texts)
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = min(num_workers, math.ceil(len(texts) / chunksize))
+
+    options = {"max_bytes": max_bytes, "compact": compact, "segmenter": segmenter}
+    chunks = [texts[start:start + chunksize] for start in range(0, len(texts), chunksize)]
+    # A custom segmenter only loads the language segmenters of its own specs
+    initializer = warmup if segmenter is None else segmenter.warmup
+    if preload:
+        initializer()
+    if num_workers <= 1:
+        segment = partial(_texts_to_words, disk_cache=disk_cache, **options)
+        return list(chain.from_iterable(map(segment, chunks)))
+
+    # Imports multiprocessing, only needed here
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Only forked workers share the loaded segmenters, but fork is not the default start method everywhere
+    mp_context = None
+    if preload and "fork" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("fork")
 
-    chunks = (utf8_chunks_grapheme_safe(word, max_bytes=max_bytes) for word in words)
-    return list(chain.from_iterable(chunks))
+    results = []
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=mp_context,
+                             initializer=partial(_init_worker, initializer, disk_cache)) as executor:
+        for words, hits, misses in executor.map(partial(_worker_texts_to_words, **options), chunks):
+            results += words
+            if disk_cache is not None:
+                disk_cache.hits += hits
+                disk_cache.misses += misses
+    return results
+
+
+def utf8_chunks_grapheme_safe_batch(words: Iterable[str], max_bytes: int = 16) -> Iterable[str]:
+    """
+    Like utf8_chunks_grapheme_safe over many words, yielding the chunks of all words in order.
+    Words already under the limit are yielded as is, without encoding them or creating a generator per word.
+    """
+    for word in words:
+        # A code point is at most 4 bytes
+        if len(word) * 4 <= max_bytes:
+            yield word
+            continue
+
+        num_bytes = len(word) if word.isascii() else len(word.encode("utf-8"))
+        if num_bytes <= max_bytes:
+            yield word
+        else:
+            yield from utf8_chunks_grapheme_safe(word, max_bytes=max_bytes)
+
+
+def _utf8_chunks_code_point_safe(text_bytes: bytes, max_bytes: int) -> list[str]:
+    """Split UTF-8 bytes into chunks of at most max_bytes bytes, without splitting code points."""
+    chunks = []
+    start = 0
+    while start < len(text_bytes):
+        end = start + max_bytes
+        if end >= len(text_bytes):
+            end = len(text_bytes)
+        else:
+            # Move back to the start of the code point (continuation bytes are 0b10xxxxxx)
+            while text_bytes[end] & 0xC0 == 0x80:
+                end -= 1
+            if end == start:  # Code point longer than max_bytes, in its own chunk
+                end += 1
+                while end < len(text_bytes) and text_bytes[end] & 0xC0 == 0x80:
+                    end += 1
+        chunks.append(text_bytes[start:end].decode("utf-8"))
+        start = end
+    return chunks
 
 
 def utf8_chunks_grapheme_safe(text: str, max_bytes: int = 16) -> Iterable[str]:
@@ -37,11 +306,21 @@ def utf8_chunks_grapheme_safe(text: str, max_bytes: int = 16) -> Iterable[str]:
     Split a string into chunks of at most max_bytes bytes, without splitting grapheme clusters.
     Except, if there is a single grapheme cluster longer than max_bytes, it will be in its own chunk. 👩‍👩‍👧‍👦
     """
+    if text.isascii() and "\r" not in text and len(text) > max_bytes >= 1:
+        # Every ASCII character (except CR, before LF) is a single-byte grapheme cluster
+        for i in range(0, len(text), max_bytes):
+            yield text[i:i + max_bytes]
+        return
+
     text_bytes = text.encode("utf-8")
     if len(text_bytes) <= max_bytes:
         yield text
         return
 
+    if _COMPILED_CLUSTERING_PATTERN.search(text) is None:
+        yield from _utf8_chunks_code_point_safe(text_bytes, max_bytes)
+        return
+
     clusters = _COMPILED_GRAPHEME_PATTERN.findall(text)
     if len(clusters) == 1:
         yield text
@@ -64,22 +343,22 @@ def utf8_chunks_grapheme_safe(text: str, max_bytes: int = 16) -> Iterable[str]:
 
 
 def is_word_complete(text: str) -> bool:
-    for pattern in _COMPLETE_WORD_PATTERNS:
-        if re.fullmatch(pattern, text):
-            return True
+    # Only a single character, or text ending with whitespace, can be complete.
+    # This rejects most incomplete words from their last character, without scanning the text.
+    if len(text) != 1 and not text[-1:].isspace():
+        return False
+    if _COMPILED_COMPLETE_WORD_PATTERN.fullmatch(text):
+        return True
 
     # TODO: not clear how to know if a word full of whitespaces is complete
     #       maybe if _TOKEN_PATTERN is not a full match, but then need to "delete" the last token.
     return False
 
 
-class WordStoppingCriteria(StoppingCriteria):
-    def __init__(self, tokenizer: PreTrainedTokenizer):
-        self.tokenizer = tokenizer
-
-    @add_start_docstrings(STOPPING_CRITERIA_INPUTS_DOCSTRING)
-    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
-        texts = self.tokenizer.batch_decode(input_ids.tolist())
-        is_done = [is_word_complete(text) for text in texts]
-        return torch.tensor(is_done, dtype=torch.bool, device=input_ids.device)
-
+def __getattr__(name: str):
+    # WordStoppingCriteria needs torch and transformers, which take seconds to import,
+    # so it is only imported when used, and text segmentation stays importable without them
+    if name == "WordStoppingCriteria":
+        from words_segmentation.stopping_criteria import WordStoppingCriteria
+        return WordStoppingCriteria
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
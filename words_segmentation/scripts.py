@@ -0,0 +1,83 @@
+"""
+Code point lookup table for the script runs of the master regex (see languages.build_regex_from_languages).
+
+Instead of matching \\p{scx=...} properties and a lookahead before every grapheme of Default spans,
+a table maps every code point to the branches whose scripts its Script_Extensions include.
+Span boundaries then come from one vectorized pass over the text's code points.
+NumPy is a dependency, but without it (or with too many branches), spans still come from the master regex.
+"""
+
+from functools import cache
+
+import regex
+
+# Flags above the branch bits, for where a grapheme cluster may continue across a Default span boundary
+_JOINS_PREVIOUS = 1 << 14  # Can extend the previous character's cluster (anything but GCB Other/Control/CR/LF/Prepend)
+_JOINS_NEXT = 1 << 15  # The next character can extend this character's cluster (GCB Prepend/ZWJ/CR)
+_MAX_BRANCHES = 14
+
+_JOINS_PREVIOUS_PATTERN = r"[^\p{GCB=Other}\p{GCB=Control}\p{GCB=CR}\p{GCB=LF}\p{GCB=Prepend}]|\p{InCB=Consonant}"
+_JOINS_NEXT_PATTERN = r"[\p{GCB=Prepend}\p{GCB=ZWJ}\p{GCB=CR}]"
+
+
+@cache
+def build_script_table(branch_scripts: tuple[tuple[str, ...], ...]):
+    """
+    NumPy uint16 table of every code point: bit i is set if its Script_Extensions include any of branch_scripts[i],
+    plus the grapheme cluster flags. None if NumPy is not installed, or there are too many branches.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    if len(branch_scripts) > _MAX_BRANCHES:
+        return None
+
+    all_chars = "".join(map(chr, range(0x110000)))
+    table = np.zeros(0x110000, dtype=np.uint16)
+    patterns = [("|".join(fr"\p{{scx={s}}}" for s in scripts), 1 << i) for i, scripts in enumerate(branch_scripts)]
+    patterns += [(_JOINS_PREVIOUS_PATTERN, _JOINS_PREVIOUS), (_JOINS_NEXT_PATTERN, _JOINS_NEXT)]
+    for pattern, bit in patterns:
+        for m in regex.finditer(f"(?:{pattern})+", all_chars):
+            table[m.start():m.end()] |= bit
+    return table
+
+
+def script_runs(text: str, branch_names: tuple[str, ...], branch_scripts: tuple[tuple[str, ...], ...],
+                default_name: str = "Default") -> list[tuple[str, int, int]] | None:
+    """
+    The (branch name, start, end) spans of text, the same as matching the master regex.
+    Every span of an explicit branch is a maximal run of its scripts' characters, starting where a character's
+    first matching branch is that branch. Default spans end before the next explicit-script character.
+    Returns None when that character may continue a grapheme cluster of the Default span,
+    which only the master regex decides, or when the table is not available.
+    """
+    table = build_script_table(branch_scripts)
+    if table is None or not text:
+        return None
+
+    import numpy as np
+
+    values = table[np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)]
+    branches = values & (_JOINS_PREVIOUS - 1)
+    # Blocks of characters with the same branches, and whether a cluster may continue across each block start
+    starts = np.flatnonzero(branches[1:] != branches[:-1]) + 1
+    ambiguous = ((values[starts] & _JOINS_PREVIOUS) | (values[starts - 1] & _JOINS_NEXT)).tolist()
+
+    def first_branch(mask: int) -> int | None:
+        return (mask & -mask).bit_length() - 1 if mask else None
+
+    runs = []
+    run_start = 0
+    run_branch = first_branch(int(branches[0]))
+    for start, mask, is_ambiguous in zip(starts.tolist(), branches[starts].tolist(), ambiguous, strict=True):
+        if run_branch is None:
+            if is_ambiguous:
+                return None
+        elif mask & (1 << run_branch):
+            continue  # The explicit branch's span continues over this block
+        runs.append((default_name if run_branch is None else branch_names[run_branch], run_start, start))
+        run_start = start
+        run_branch = first_branch(mask)
+    runs.append((default_name if run_branch is None else branch_names[run_branch], run_start, len(text)))
+    return runs
@@ -0,0 +1,205 @@
+"""
+Stopping criteria for generating one word at a time.
+Imported lazily from words_segmentation.pretokenizer, since it requires torch and transformers.
+"""
+
+import re
+from functools import cache
+
+import torch
+from transformers import PreTrainedTokenizer, StoppingCriteria, add_start_docstrings
+from transformers.generation.stopping_criteria import STOPPING_CRITERIA_INPUTS_DOCSTRING
+
+from words_segmentation.control import CONTROL_TOKENS_PATTERN
+
+_COMPILED_CONTROL_PATTERN = re.compile(rf"[{CONTROL_TOKENS_PATTERN}]")
+_COMPILED_WORD_CHARS_PATTERN = re.compile(rf"[^\s{CONTROL_TOKENS_PATTERN}]*")
+# Token ids kept from the end of every sequence, to tell whether the next call continues the same sequences
+_TAIL_LENGTH = 8
+
+
+class _IncrementalWordState:
+    """
+    Decoding state of one generated sequence, for is_word_complete without re-decoding the whole sequence.
+
+    Token ids are decoded incrementally: the text of the newest ids is the difference between decoding
+    ids[prefix_offset:] and ids[prefix_offset:read_offset], and is held back while it ends with an
+    incomplete character (U+FFFD), so it is the same as decoding the whole sequence at once.
+    is_word_complete fully matches the text, which only depends on whether all characters before the last one
+    are word characters, and on the last character.
+    """
+
+    __slots__ = ("ids", "prefix_offset", "read_offset", "pending", "num_chars", "clean", "last")
+
+    def __init__(self):
+        self.ids: list[int] = []
+        self.prefix_offset = 0
+        self.read_offset = 0
+        self.pending = False  # The newest ids decode to an incomplete character
+        self.num_chars = 0
+        self.clean = True  # All characters before the last one are word characters
+        self.last = ""
+
+    def feed(self, text: str):
+        if not text:
+            return
+        if self.clean and self.num_chars:
+            self.clean = _COMPILED_WORD_CHARS_PATTERN.fullmatch(self.last) is not None
+        if self.clean:
+            self.clean = _COMPILED_WORD_CHARS_PATTERN.fullmatch(text, 0, len(text) - 1) is not None
+        self.num_chars += len(text)
+        self.last = text[-1]
+
+    def is_complete(self) -> bool:
+        if self.pending:
+            return False
+        if self.num_chars == 1:
+            return _COMPILED_CONTROL_PATTERN.match(self.last) is not None
+        return self.num_chars > 1 and self.clean and self.last.isspace()
+
+
+@cache
+def _utf8_break_tables(device: torch.device) -> tuple[dict[int, torch.LongTensor], torch.LongTensor]:
+    """
+    UTF-8 encodings of all whitespace characters (as matched by is_word_complete) by encoded length,
+    and the control token bytes, as tensors on the device.
+    """
+    # All whitespace characters are below U+3001
+    whitespace = {}
+    for char in map(chr, range(0x3001)):
+        if char.isspace():
+            encoded = char.encode("utf-8")
+            whitespace.setdefault(len(encoded), []).append(list(encoded))
+    whitespace = {length: torch.tensor(sequences, device=device) for length, sequences in whitespace.items()}
+    controls = [ord(char) for char in map(chr, range(0x80)) if _COMPILED_CONTROL_PATTERN.match(char)]
+    return whitespace, torch.tensor(controls, device=device)
+
+
+def _utf8_breaks(byte_ids: torch.LongTensor) -> tuple[torch.BoolTensor, torch.LongTensor, torch.BoolTensor]:
+    """
+    For UTF-8 byte ids, find where whitespace and control characters end.
+    Returns a mask of positions where a whitespace or control character ends,
+    the byte length of the whitespace character ending at every position (0 if none),
+    and a mask of control characters.
+    Multi-byte characters are only found when all their bytes are in byte_ids.
+    """
+    whitespace, controls = _utf8_break_tables(byte_ids.device)
+    widths = torch.isin(byte_ids, whitespace[1][:, 0]).long()
+    for length, sequences in whitespace.items():
+        if length == 1 or byte_ids.shape[1] < length:
+            continue
+        windows = byte_ids.unfold(1, length, 1)  # (batch, positions - length + 1, length)
+        found = (windows.unsqueeze(2) == sequences).all(dim=-1).any(dim=-1)
+        widths[:, length - 1:] = torch.where(found, length, widths[:, length - 1:])
+
+    is_control = torch.isin(byte_ids, controls)
+    return (widths > 0) | is_control, widths, is_control
+
+
+class WordStoppingCriteria(StoppingCriteria):
+    """
+    Stops each sequence once its decoded text is a complete word (see is_word_complete).
+
+    Decoding is incremental: every step only copies and decodes the newly generated token ids,
+    so step latency does not grow with the sequence length.
+    The first prompt_length token ids of every sequence are not decoded, nor considered part of the word.
+    The criteria resets itself when called with new sequences: a different batch size, shorter sequences,
+    or sequences that do not end with the last token ids seen (up to 8 per sequence, copied to the host
+    with the new ids), so one instance can be reused across generate() calls. reset() also resets it explicitly.
+
+    With byte_level=True, token ids must be UTF-8 bytes (like UTF8Tokenizer), and completion is computed
+    with tensor ops on the device, without decoding or copying token ids to the host.
+    Comparing the last token ids would copy them to the host, so only a different batch size or shorter sequences
+    reset it: call reset() before reusing it for new sequences of the same batch size.
+    """
+
+    def __init__(self, tokenizer: PreTrainedTokenizer, prompt_length: int = 0, byte_level: bool = False):
+        self.tokenizer = tokenizer
+        self.prompt_length = prompt_length
+        self.byte_level = byte_level
+        self.reset()
+
+    def reset(self, batch_size: int = 0):
+        self._states = [_IncrementalWordState() for _ in range(batch_size)]
+        self._length = self.prompt_length
+        self._first_break = None  # byte_level: position where the first whitespace/control character ends
+        self._tail = None  # The last token ids seen of every sequence, ending at self._length
+
+    def _continues(self, input_ids: torch.LongTensor) -> bool:
+        """Whether input_ids continue the sequences seen so far."""
+        if input_ids.shape[0] != len(self._states) or input_ids.shape[1] < self._length:
+            return False
+        if self.byte_level or self._tail is None:
+            return True
+        return torch.equal(input_ids[:, self._length - self._tail.shape[1]:self._length], self._tail)
+
+    @add_start_docstrings(STOPPING_CRITERIA_INPUTS_DOCSTRING)
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        if not self._continues(input_ids):
+            self.reset(input_ids.shape[0])
+
+        if self.byte_level:
+            return self._byte_level_call(input_ids)
+        is_done = self._decode_call(input_ids)
+        self._tail = input_ids[:, max(self.prompt_length, self._length - _TAIL_LENGTH):self._length].clone()
+        return is_done
+
+    def _decode_call(self, input_ids: torch.LongTensor) -> torch.BoolTensor:
+        length = input_ids.shape[1]
+        if length > self._length:
+            for state, new_ids in zip(self._states, input_ids[:, self._length:].tolist(), strict=True):
+                state.ids.extend(new_ids)
+            self._length = length
+
+            states = [state for state in self._states if state.read_offset < len(state.ids)]
+            prefix_texts = self.tokenizer.batch_decode([s.ids[s.prefix_offset:s.read_offset] for s in states])
+            texts = self.tokenizer.batch_decode([s.ids[s.prefix_offset:] for s in states])
+            for state, prefix_text, text in zip(states, prefix_texts, texts, strict=True):
+                state.pending = text.endswith("\ufffd")
+                if len(text) > len(prefix_text) and not state.pending:
+                    state.feed(text[len(prefix_text):])
+                    state.prefix_offset, state.read_offset = state.read_offset, len(state.ids)
+
+        is_done = [state.is_complete() for state in self._states]
+        return torch.tensor(is_done, dtype=torch.bool, device=input_ids.device)
+
+    def _byte_level_call(self, input_ids: torch.LongTensor) -> torch.BoolTensor:
+        """
+        The word (after the prompt) is complete if it is a single control character, or if its first
+        whitespace/control character is whitespace, is its last character, and is not its first character.
+        Like decoding with errors="ignore", a trailing incomplete UTF-8 character is not part of the word yet.
+        """
+        batch_size, length = input_ids.shape
+        device = input_ids.device
+        no_break = torch.iinfo(torch.long).max
+        if self._first_break is None:
+            self._first_break = torch.full((batch_size,), no_break, dtype=torch.long, device=device)
+
+        # Enough context for a trailing incomplete character (up to 3 bytes), preceded by a whitespace
+        # character (up to 3 bytes), and for multi-byte whitespace characters that end in the new bytes
+        start = max(min(self._length, length) - 6, self.prompt_length)
+        window = input_ids[:, start:]
+        breaks, widths, is_control = _utf8_breaks(window)
+        if length > self._length:
+            positions = torch.arange(self._length, length, device=device)
+            new_breaks = torch.where(breaks[:, self._length - start:], positions, no_break)
+            self._first_break = torch.minimum(self._first_break, new_breaks.min(dim=1).values)
+            self._length = length
+
+        # Bytes of a trailing incomplete character, from its lead byte (assumes valid UTF-8)
+        trailing = torch.zeros(batch_size, dtype=torch.long, device=device)
+        for k in range(min(3, window.shape[1]), 0, -1):
+            byte = window[:, -k]
+            char_length = 2 + (byte >= 0xE0).long() + (byte >= 0xF0).long()
+            trailing = torch.where(byte >= 0xC0, torch.where(char_length > k, k, 0), trailing)
+
+        # The last complete character ends at `end`
+        end = length - 1 - trailing
+        index = (end - start).clamp(min=0).unsqueeze(1)
+        last_width = widths.gather(1, index).squeeze(1)
+        last_is_control = is_control.gather(1, index).squeeze(1)
+        has_word = end >= self.prompt_length
+
+        is_whitespace_end = (last_width > 0) & (self._first_break == end) & (end - last_width >= self.prompt_length)
+        is_single_control = last_is_control & (end == self.prompt_length)
+        return has_word & (is_whitespace_end | is_single_control)
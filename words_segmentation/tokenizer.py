@@ -3,7 +3,15 @@ import math
 from transformers import AutoTokenizer, PreTrainedTokenizer
 from transformers.tokenization_utils_base import TextInput
 
-from words_segmentation.pretokenizer import text_to_words, words_to_text
+from words_segmentation.cache import SpanCache
+from words_segmentation.languages import Segmenter
+from words_segmentation.pretokenizer import (
+    segment_batch,
+    text_to_words,
+    text_to_words_batch,
+    text_to_words_with_offsets,
+    words_to_text,
+)
 
 
 class WordsSegmentationTokenizer(PreTrainedTokenizer):
@@ -12,9 +20,30 @@ class WordsSegmentationTokenizer(PreTrainedTokenizer):
     extending PreTrainedTokenizer for basic Hugging Face ecosystem support.
     """
 
-    def __init__(self, max_bytes: int = math.inf, **kwargs):
-        super().__init__(**kwargs)
+    def __init__(self,
+                 max_bytes: int | None = math.inf,
+                 span_cache_size: int = 0,
+                 span_cache_max_bytes: int = 64 * 2 ** 20,
+                 segmenter: Segmenter | None = None,
+                 **kwargs):
+        """
+        Args:
+            max_bytes: Split words longer than this many UTF-8 bytes, at grapheme boundaries (None for no limit)
+            span_cache_size: Number of Chinese/Japanese/SignWriting spans to keep in an LRU cache (0 disables it)
+            span_cache_max_bytes: Approximate memory budget of the span cache
+            segmenter: Segmenter with its own language specs (default LANGUAGE_SPECS).
+                It is not saved by save_pretrained, so pass it again to from_pretrained.
+        """
+        if max_bytes is None:
+            max_bytes = math.inf
+        # Passed on, so they are kept in init_kwargs, and saved by save_pretrained
+        super().__init__(max_bytes=max_bytes,
+                         span_cache_size=span_cache_size,
+                         span_cache_max_bytes=span_cache_max_bytes,
+                         **kwargs)
         self.max_bytes = max_bytes
+        self.segmenter = segmenter
+        self.span_cache = SpanCache(span_cache_size, span_cache_max_bytes) if span_cache_size > 0 else None
 
     @property
     def vocab_size(self) -> float:
@@ -27,11 +56,37 @@ class WordsSegmentationTokenizer(PreTrainedTokenizer):
         return {}
 
     def _tokenize(self, text: TextInput, **kwargs):
-        return text_to_words(text, max_bytes=self.max_bytes)
-
-    def tokenize(self, text: TextInput, **kwargs):
+        return text_to_words(text, max_bytes=self.max_bytes, cache=self.span_cache, segmenter=self.segmenter)
+
+    def tokenize(self, text: TextInput, return_offsets_mapping: bool = False, **kwargs):
+        """With return_offsets_mapping, returns (tokens, offsets) where offsets are (start, end) character spans."""
+        if return_offsets_mapping:
+            words, offsets, _ = text_to_words_with_offsets(text, max_bytes=self.max_bytes, cache=self.span_cache,
+                                                           segmenter=self.segmenter)
+            return words, offsets
         return self._tokenize(text, **kwargs)
 
+    def batch_tokenize(self,
+                       texts: list[TextInput],
+                       num_workers: int | None = None,
+                       chunksize: int = 64,
+                       preload: bool = False):
+        """
+        Tokenize many texts in parallel worker processes, returning results in input order.
+        With preload=True, the language segmenters are loaded here once, and shared with forked workers.
+        """
+        return text_to_words_batch(texts, max_bytes=self.max_bytes, num_workers=num_workers,
+                                   chunksize=chunksize, preload=preload, segmenter=self.segmenter)
+
+    def batch_segment(self, batch: dict[str, list], column: str = "text", return_byte_offsets: bool = False):
+        """
+        Segment a batch of texts into words, with this tokenizer's max_bytes and span cache.
+        For datasets.Dataset.map(tokenizer.batch_segment, batched=True, num_proc=...), see segment_batch.
+        """
+        return segment_batch(batch, column=column, max_bytes=self.max_bytes,
+                             return_byte_offsets=return_byte_offsets, cache=self.span_cache,
+                             segmenter=self.segmenter)
+
     def _encode_plus(self, text: TextInput, **kwargs):
         raise Exception("WordsSegmentationTokenizer can not encode to ids")
 
@@ -48,6 +103,17 @@ class WordsSegmentationTokenizer(PreTrainedTokenizer):
     def build_inputs_with_special_tokens(self, **unused_kwargs):
         raise Exception("WordsSegmentationTokenizer does not use special tokens")
 
+    def save_pretrained(self, *args, **kwargs):
+        # save_pretrained saves the attributes named like init arguments, and no limit is saved as null,
+        # since Infinity is not valid JSON
+        max_bytes = self.max_bytes
+        if max_bytes == math.inf:
+            self.max_bytes = self.init_kwargs["max_bytes"] = None
+        try:
+            return super().save_pretrained(*args, **kwargs)
+        finally:
+            self.max_bytes = self.init_kwargs["max_bytes"] = max_bytes
+
     def save_vocabulary(self, save_directory: str, filename_prefix: str | None = None):
         return ()
 
@@ -0,0 +1,191 @@
+"""
+Compact double-array trie over a word list, saved to a single file and memory-mapped for lookups.
+
+Characters are mapped to dense codes (1..alphabet size, 0 marks the end of a word), so the arrays stay small
+even for scripts far from ASCII. A transition from node s with code c goes to t = base[s] + c when check[t] == s.
+Characters outside the alphabet get code alphabet size + 1, which no transition has, and the arrays are padded
+so that base[s] + c is always in range, leaving a single check per character.
+The base of a word's end-of-word node is its index in the sorted words, and in the array of their values
+(e.g. log frequencies) if any.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterable, Mapping
+from itertools import pairwise
+from pathlib import Path
+
+from words_segmentation.cache import get_cache_dir
+
+_MAGIC = b"WSDAT002"
+_END = 0  # Code of the end-of-word transition
+
+
+def _find_base(used: bytearray, labels: list[int], first_free: int, window: int = 2 ** 16) -> int:
+    """
+    The first base where all the labels' slots are free, searched from first_free, or in the last window slots.
+    The search is a regular expression over the used flags, with a zero byte at every label's offset.
+    used must end with enough free slots for any node, so there is always a match.
+    """
+    start = max(first_free, len(used) - window, labels[0] + 1)
+    if len(labels) == 1:
+        return used.find(0, start) - labels[0]
+    pattern = b"\x00" + b"".join(b"(?s:.{%d})\x00" % (b - a - 1) for a, b in pairwise(labels))
+    return re.compile(pattern).search(used, start).start() - labels[0]
+
+
+class DoubleArrayTrie:
+    """Lookups of all dictionary words starting at a position of a text."""
+
+    def __init__(self, alphabet: str, base, check, values=None):
+        self.alphabet = alphabet
+        self.codes = {char: code for code, char in enumerate(alphabet, start=1)}
+        self.unknown_code = len(alphabet) + 1
+        self.base = base
+        self.check = check
+        self.values = values
+
+    @classmethod
+    def build(cls, words: Iterable[str] | Mapping[str, float]) -> "DoubleArrayTrie":
+        """Build a trie of words, or of a mapping from words to their values."""
+        word_values = words if isinstance(words, Mapping) else None
+        words = sorted({word for word in words if word})
+        # Frequent characters get small codes, so the children of a node are close together
+        alphabet = "".join(char for char, _ in Counter(char for word in words for char in word).most_common())
+        codes = {char: code for code, char in enumerate(alphabet, start=1)}
+
+        # A nested dict trie first, then every node's children are placed at the first base where they fit
+        root = {}
+        for word_index, word in enumerate(words):
+            node = root
+            for char in word:
+                node = node.setdefault(codes[char], {})
+            node[_END] = word_index
+
+        # The arrays always end with free slots for any node's children, which also pads them for lookups
+        padding = len(alphabet) + 2
+        base = array("i", [0]) * (1 + padding)
+        check = array("i", [-1]) * (1 + padding)
+        used = bytearray(1 + padding)
+        used[0] = 1  # The root
+        first_free = 1
+        queue = [(0, root)] if root else []
+        for index, children in queue:
+            if not isinstance(children, dict):  # An end-of-word node
+                base[index] = children
+                continue
+            labels = sorted(children)
+            node_base = _find_base(used, labels, first_free)
+
+            needed = node_base + labels[-1] + 1 + padding - len(used)
+            if needed > 0:
+                used.extend(bytes(needed))
+                base.extend(array("i", [0]) * needed)
+                check.extend(array("i", [-1]) * needed)
+            base[index] = node_base
+            for label in labels:
+                used[node_base + label] = 1
+                check[node_base + label] = index
+                queue.append((node_base + label, children[label]))
+            first_free = used.find(0, first_free)
+
+        values = None if word_values is None else array("d", (word_values[word] for word in words))
+        return cls(alphabet, base, check, values)
+
+    def save(self, path: str | Path):
+        alphabet = array("i", map(ord, self.alphabet))
+        header = array("i", [len(alphabet), len(self.base), 0 if self.values is None else len(self.values)])
+        with open(path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(header.tobytes())
+            f.write(alphabet.tobytes())
+            f.write(array("i", self.base).tobytes())
+            f.write(array("i", self.check).tobytes())
+            if self.values is not None:
+                f.write(array("d", self.values).tobytes())
+
+    @classmethod
+    def load(cls, path: str | Path) -> "DoubleArrayTrie":
+        """Memory-map a saved trie: pages are read lazily, and shared between processes."""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(buffer)
+        if view[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path} is not a saved DoubleArrayTrie")
+        offset = len(_MAGIC)
+        alphabet_size, size, num_values = view[offset:offset + 12].cast("i")
+        offset += 12
+        alphabet = "".join(map(chr, view[offset:offset + 4 * alphabet_size].cast("i")))
+        offset += 4 * alphabet_size
+        base = view[offset:offset + 4 * size].cast("i")
+        check = view[offset + 4 * size:offset + 8 * size].cast("i")
+        offset += 8 * size
+        values = view[offset:offset + 8 * num_values].cast("d") if num_values else None
+        return cls(alphabet, base, check, values)
+
+    def encode(self, text: str) -> list[int]:
+        """The codes of text's characters, to look up many positions of the same text."""
+        get, unknown_code = self.codes.get, self.unknown_code
+        return [get(char, unknown_code) for char in text]
+
+    def word_index(self, word: str) -> int | None:
+        """Index of the word in the sorted words (and in the values), or None if it is not in the trie."""
+        state = 0
+        for code in self.encode(word):
+            target = self.base[state] + code
+            if self.check[target] != state:
+                return None
+            state = target
+        terminal = self.base[state] + _END
+        return self.base[terminal] if word and self.check[terminal] == state else None
+
+    def __contains__(self, word: str) -> bool:
+        return self.word_index(word) is not None
+
+    def get(self, word: str, default: float | None = None) -> float | None:
+        """The value of a word, or default if it is not in the trie."""
+        index = self.word_index(word)
+        return default if index is None or self.values is None else self.values[index]
+
+    def prefixes(self, codes: list[int], start: int) -> list[tuple[int, int]]:
+        """
+        The (end position, word index) of all dictionary words that the encoded text starts with at start,
+        shortest first.
+        """
+        base, check = self.base, self.check
+        matches = []
+        state = 0
+        node_base = base[0]
+        for i in range(start, len(codes)):
+            target = node_base + codes[i]
+            if check[target] != state:
+                break
+            state = target
+            node_base = base[state]
+            if check[node_base] == state:  # The end-of-word transition (code 0)
+                matches.append((i + 1, base[node_base]))
+        return matches
+
+    def prefix_ends(self, codes: list[int], start: int) -> list[int]:
+        """The end positions of all dictionary words that the encoded text starts with at start, ascending."""
+        return [end for end, _ in self.prefixes(codes, start)]
+
+
+def load_cached_trie(name: str, source: Path, build: Callable[[], DoubleArrayTrie]) -> DoubleArrayTrie:
+    """
+    Memory-map the trie built from a source file, cached in get_cache_dir() by the source's path,
+    size and modification time. On a cache miss, the trie is built with build() and saved first.
+    """
+    stat = source.stat()
+    key = f"{_MAGIC.decode()}:{source.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    trie_path = get_cache_dir(create=False) / "tries" / f"{name}-{hashlib.sha1(key.encode()).hexdigest()[:16]}.dat"
+    if not trie_path.exists():
+        trie_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = trie_path.with_suffix(f".{os.getpid()}.tmp")
+        build().save(temporary_path)
+        os.replace(temporary_path, trie_path)  # Concurrent builders write the same file
+    return DoubleArrayTrie.load(trie_path)